@@ -6,81 +6,455 @@ Removes paragraphs that appear more than 2 times in a file
 Usage:
   python clean-repetitions.py --epic 7              # Clean Epic 7 only
   python clean-repetitions.py --all                 # Clean all stories
+  python clean-repetitions.py --all --jobs 8        # Compute rewrites in 8 worker processes
   python clean-repetitions.py --dry-run             # Preview changes
+  python clean-repetitions.py --rollback MANIFEST   # Restore files from a previous run
+  python clean-repetitions.py --all --max-file-bytes 0   # No per-file size budget
+  python clean-repetitions.py --all --keep-transactions 3 # Keep fewer rollback backups
+
+Story files are streamed, and writes are transactional: every rewrite is
+staged to a temp file next to its target, originals are copied into a
+transaction directory together with a manifest, and the staged files are
+then committed with atomic renames. If any rename fails, already-committed
+files are restored before exiting, so a run either applies all of its
+rewrites or none of them.
+
+Each committed run's transaction directory holds a full copy of every file
+it rewrote, so only the newest --keep-transactions (default: 10) finished
+transactions are kept; older ones are deleted after each commit and can no
+longer be rolled back. Transactions interrupted mid-commit are never pruned.
 """
 
 import os
 import sys
+import json
+import shutil
+import hashlib
 import argparse
 from pathlib import Path
-from collections import defaultdict
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+# Shared helpers live in scripts/lib
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent / 'scripts' / 'lib'))
+from story_archive import StoryPack  # noqa: E402
+from story_stream import iter_sorted_story_files  # noqa: E402
+from story_budget import BudgetExceeded, FileBudget, add_budget_arguments  # noqa: E402
+from story_paragraphs import ParagraphCounter, iter_paragraphs, iter_text_chunks  # noqa: E402
+import story_trace  # noqa: E402
 
 STORY_DIR = Path("_bmad-output/implementation-artifacts/sprint-artifacts")
+TXN_DIR = Path(".clean-repetitions-txn")
+# Finished transactions kept for --rollback; older ones are pruned after each commit
+DEFAULT_KEEP_TRANSACTIONS = 10
 
 
-def clean_repetitions(filepath: Path, dry_run: bool = True) -> int:
-    """Remove repetitive paragraphs from a story file"""
+def count_paragraphs(chunks, budget: FileBudget = None) -> ParagraphCounter:
+    """Count substantial paragraphs (>50 chars) by fingerprint from a stream of text chunks"""
+    counter = ParagraphCounter()
+    for para in iter_paragraphs(chunks):
+        if budget is not None:
+            budget.tick()
+        cleaned = para.strip()
+        if len(cleaned) > 50:  # Only track substantial paragraphs
+            counter.add(cleaned)
+    return counter
 
-    with open(filepath, 'r', encoding='utf-8') as f:
-        content = f.read()
 
-    # Split into paragraphs (double newline separated)
-    paragraphs = content.split('\n\n')
+def iter_deduplicated(chunks, counter: ParagraphCounter, budget: FileBudget = None):
+    """Yield the paragraphs to keep: all but repeats of paragraphs counted more than 2 times"""
+    seen = set()
+    for para in iter_paragraphs(chunks):
+        if budget is not None:
+            budget.tick()
+        cleaned = para.strip()
+        if len(cleaned) > 50:
+            index = counter.index(cleaned)
+            if index is not None and counter.count(index) > 2:
+                if index in seen:
+                    continue  # Skip duplicates, keep first occurrence
+                seen.add(index)
+        yield para
 
-    # Track paragraph occurrences (only for substantial paragraphs >50 chars)
-    para_counts = defaultdict(int)
-    para_indices = defaultdict(list)
 
-    for i, para in enumerate(paragraphs):
-        cleaned = para.strip()
-        if len(cleaned) > 50:  # Only track substantial paragraphs
-            para_counts[cleaned] += 1
-            para_indices[cleaned].append(i)
+def _preview_lines(repetitive_paras: dict, dry_run: bool):
+    """Format the per-paragraph summary lines for a cleaned file"""
+    lines = []
+    for para, count in repetitive_paras.items():
+        preview = para[:60] + "..." if len(para) > 60 else para
+        if dry_run:
+            lines.append(f"  - '{preview}' appears {count} times")
+        else:
+            lines.append(f"  - '{preview}' appeared {count} times (kept 1)")
+    return lines
 
-    # Find paragraphs that appear more than 2 times
-    repetitive_paras = {p: count for p, count in para_counts.items() if count > 2}
 
-    if not repetitive_paras:
-        return 0  # No repetitions found
+def plan_rewrite(filepath: Path, dry_run: bool = True, budget: FileBudget = None) -> dict:
+    """
+    Compute the rewrite for a single story file and stage it
 
-    # Remove duplicates (keep first occurrence, remove rest)
-    cleaned_paragraphs = []
-    seen_paras = set()
-    removed_count = 0
+    Runs inside worker processes, so it only returns plain data. Unless
+    dry_run is set, changed output is written to a staged temp file next to
+    the target (see commit_rewrites); the target itself is not touched.
+    The file is streamed twice (count, then write), so memory is bounded by
+    the distinct paragraphs rather than the file size.
 
-    for i, para in enumerate(paragraphs):
-        cleaned = para.strip()
+    Files over the budget's byte limit are not read, and files whose count or
+    rewrite pass runs over its CPU limit are left untouched; both come back
+    with a 'skipped' reason instead of a rewrite.
 
-        # If this is a repetitive paragraph
-        if cleaned in repetitive_paras:
-            if cleaned not in seen_paras:
-                # Keep first occurrence
-                cleaned_paragraphs.append(para)
-                seen_paras.add(cleaned)
-            else:
-                # Skip duplicates
-                removed_count += 1
-        else:
-            # Keep non-repetitive paragraphs
-            cleaned_paragraphs.append(para)
+    Returns:
+        Dict with path, size, removed count, preview lines, skipped reason (or
+        None), and the staged path plus before/after hashes and sizes
+        (staged is None when nothing needs writing)
+    """
+    budget = budget or FileBudget()
+    plan = {
+        'path': str(filepath),
+        'size': 0,
+        'removed': 0,
+        'preview': [],
+        'skipped': None,
+        'staged': None,
+    }
 
-    if removed_count > 0:
-        new_content = '\n\n'.join(cleaned_paragraphs)
+    file_size = filepath.stat().st_size
+    if budget.oversized(file_size):
+        plan['skipped'] = (f"oversized/pathological file: {file_size} bytes exceeds "
+                           f"the {budget.max_bytes} byte read budget")
+        return plan
 
-        if dry_run:
-            print(f"Would remove {removed_count} repetitions from {filepath.name}")
-            for para, count in repetitive_paras.items():
-                preview = para[:60] + "..." if len(para) > 60 else para
-                print(f"  - '{preview}' appears {count} times")
-        else:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(new_content)
-            print(f"✓ Removed {removed_count} repetitions from {filepath.name}")
-            for para, count in repetitive_paras.items():
-                preview = para[:60] + "..." if len(para) > 60 else para
-                print(f"  - '{preview}' appeared {count} times (kept 1)")
+    # Pass 1: count paragraphs while streaming (and hashing) the file
+    digest = hashlib.sha256()
+    try:
+        budget.start("count")
+        with open(filepath, 'rb') as f:
+            counter = count_paragraphs(iter_text_chunks(f, digest), budget)
+            plan['size'] = f.tell()
+        budget.finish()
+    except BudgetExceeded as e:
+        plan['skipped'] = f"oversized/pathological file: {e}"
+        return plan
+
+    repetitive_paras = {p: count for p, count in counter.items() if count > 2}
+    removed_count = sum(count - 1 for count in repetitive_paras.values())
+
+    plan.update(removed=removed_count, preview=_preview_lines(repetitive_paras, dry_run))
+
+    if removed_count > 0 and not dry_run:
+        staged = filepath.with_name(f".{filepath.name}.clean-tmp")
+        try:
+            budget.start("rewrite")
+            sha256_after, size_after = _stage_cleaned(filepath, staged, counter, digest.hexdigest(), budget)
+            budget.finish()
+        except BudgetExceeded as e:
+            staged.unlink(missing_ok=True)
+            plan.update(removed=0, preview=[], skipped=f"oversized/pathological file: {e}")
+            return plan
+        plan.update(staged=str(staged), sha256_before=digest.hexdigest(), sha256_after=sha256_after,
+                    size_after=size_after)
+
+    return plan
+
+
+def _stage_cleaned(filepath: Path, staged: Path, counter: ParagraphCounter, sha256_before: str,
+                   budget: FileBudget = None):
+    """
+    Pass 2: stream the kept paragraphs of filepath into the staged file
+
+    Returns:
+        Tuple of (sha256, size) of the staged output
+    """
+    before = hashlib.sha256()
+    after = hashlib.sha256()
+    size_after = 0
+
+    try:
+        with open(filepath, 'rb') as src, open(staged, 'wb') as dst:
+            separator = b''
+            for para in iter_deduplicated(iter_text_chunks(src, before), counter, budget):
+                data = separator + para.encode('utf-8')
+                dst.write(data)
+                after.update(data)
+                size_after += len(data)
+                separator = b'\n\n'
+            dst.flush()
+            os.fsync(dst.fileno())
+
+        if before.hexdigest() != sha256_before:
+            raise RuntimeError(f"{filepath.name} changed while cleaning - aborting without changes")
+    except BaseException:
+        staged.unlink(missing_ok=True)
+        raise
+
+    return after.hexdigest(), size_after
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _fsync_write(path: Path, data: bytes):
+    """Write bytes and flush them to disk before returning"""
+    with open(path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _write_manifest(manifest_path: Path, manifest: dict):
+    tmp_path = manifest_path.with_suffix('.json.tmp')
+    _fsync_write(tmp_path, json.dumps(manifest, indent=2).encode('utf-8'))
+    os.replace(tmp_path, manifest_path)
+
+
+def commit_rewrites(plans: list) -> Path:
+    """
+    Apply a batch of staged rewrites all-or-nothing
+
+    1. Copy each original into the transaction directory and record it,
+       with its staged temp file, in manifest.json
+    2. Atomically rename every staged file over its target
+
+    Nothing is renamed if any original changed since it was planned. If a
+    rename fails, every file already committed is restored from its backup
+    and the error is re-raised.
+
+    Returns:
+        Path to the transaction manifest
+    """
+    plans = [p for p in plans if p['staged'] is not None]
+
+    txn_path = TXN_DIR / datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+    backup_dir = txn_path / 'originals'
+    backup_dir.mkdir(parents=True)
+    manifest_path = txn_path / 'manifest.json'
+
+    manifest = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'state': 'staging',
+        'files': [],
+    }
+
+    try:
+        for plan in plans:
+            target = Path(plan['path'])
+            backup = backup_dir / target.name
+
+            original = target.read_bytes()
+            if _sha256(original) != plan['sha256_before']:
+                raise RuntimeError(f"{target.name} changed while cleaning - aborting without changes")
+            _fsync_write(backup, original)
+
+            manifest['files'].append({
+                'path': str(target),
+                'staged': plan['staged'],
+                'backup': str(backup),
+                'sha256_before': plan['sha256_before'],
+                'sha256_after': plan['sha256_after'],
+            })
+    except Exception:
+        discard_staged(plans)
+        shutil.rmtree(txn_path, ignore_errors=True)
+        raise
+
+    manifest['state'] = 'committing'
+    _write_manifest(manifest_path, manifest)
+
+    committed = []
+    try:
+        for entry in manifest['files']:
+            os.replace(entry['staged'], entry['path'])
+            committed.append(entry)
+    except Exception:
+        print("❌ Commit failed - restoring original files", file=sys.stderr)
+        for entry in committed:
+            _restore(entry)
+        for entry in manifest['files']:
+            Path(entry['staged']).unlink(missing_ok=True)
+        manifest['state'] = 'rolled-back'
+        _write_manifest(manifest_path, manifest)
+        raise
 
-    return removed_count
+    manifest['state'] = 'committed'
+    _write_manifest(manifest_path, manifest)
+    for plan in plans:
+        story_trace.record_write(plan['path'], plan['size_after'])
+    return manifest_path
+
+
+def prune_transactions(keep: int = DEFAULT_KEEP_TRANSACTIONS) -> int:
+    """
+    Delete all but the newest `keep` committed or rolled-back transactions
+
+    Transaction directories are named by timestamp, so name order is age
+    order. Transactions in any other state (e.g. a crash mid-commit) are
+    kept for recovery.
+
+    Returns:
+        Number of transactions deleted
+    """
+    finished = []
+    for txn_path in sorted(TXN_DIR.iterdir()) if TXN_DIR.exists() else []:
+        try:
+            state = json.loads((txn_path / 'manifest.json').read_text()).get('state')
+        except (OSError, ValueError):
+            continue
+        if state in ('committed', 'rolled-back'):
+            finished.append(txn_path)
+
+    expired = finished[:-keep] if keep > 0 else finished
+    for txn_path in expired:
+        shutil.rmtree(txn_path, ignore_errors=True)
+    return len(expired)
+
+
+def discard_staged(plans: list):
+    """Remove staged temp files that will not be committed"""
+    for plan in plans:
+        if plan['staged'] is not None:
+            Path(plan['staged']).unlink(missing_ok=True)
+
+
+def _restore(entry: dict):
+    """Atomically put a file's backed-up original back in place"""
+    target = Path(entry['path'])
+    restore_tmp = target.with_name(f".{target.name}.restore-tmp")
+    shutil.copyfile(entry['backup'], restore_tmp)
+    os.replace(restore_tmp, target)
+
+
+def rollback(manifest_path: Path) -> int:
+    """
+    Restore every file recorded in a transaction manifest
+
+    Files whose current content matches neither the original nor the
+    rewritten version were changed after the run and are left alone.
+
+    Returns:
+        Number of files restored
+    """
+    manifest = json.loads(manifest_path.read_text())
+    restored = 0
+
+    for entry in manifest['files']:
+        target = Path(entry['path'])
+        Path(entry['staged']).unlink(missing_ok=True)
+
+        current = _sha256(target.read_bytes()) if target.exists() else None
+        if current == entry['sha256_before']:
+            continue
+        if current is not None and current != entry['sha256_after']:
+            print(f"⚠️  {target.name}: modified since run, not restored")
+            continue
+
+        _restore(entry)
+        restored += 1
+        print(f"✓ Restored {target.name}")
+
+    manifest['state'] = 'rolled-back'
+    _write_manifest(manifest_path, manifest)
+    return restored
+
+
+def iter_plans(story_files, dry_run: bool = True, jobs: int = 1, budget: FileBudget = None):
+    """
+    Yield plan_rewrite() results in input order
+
+    With jobs > 1, files are planned in worker processes with a bounded
+    number of files in flight, so the input can be a lazy stream.
+    """
+    if jobs <= 1:
+        for filepath in story_files:
+            yield plan_rewrite(filepath, dry_run, budget)
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        pending = deque()
+        try:
+            for filepath in story_files:
+                pending.append(executor.submit(plan_rewrite, filepath, dry_run, budget))
+                if len(pending) >= jobs * 4:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        except BaseException:
+            _discard_pending(pending)
+            raise
+
+
+def _discard_pending(pending):
+    """Cancel queued plans and remove the staged output of those already running"""
+    for future in pending:
+        future.cancel()
+    for future in pending:
+        if future.cancelled():
+            continue
+        try:
+            plan = future.result()
+        except BaseException:
+            continue  # plan_rewrite removes its own staged file when it fails
+        discard_staged([plan])
+
+
+def clean_batch(story_files, dry_run: bool = True, jobs: int = 1, budget: FileBudget = None,
+                keep_transactions: int = DEFAULT_KEEP_TRANSACTIONS):
+    """
+    Clean a batch of story files
+
+    Rewrites are computed (and staged) in up to `jobs` worker processes,
+    then committed together via commit_rewrites(), after which old
+    transactions are pruned. Only metadata for changed files is kept in
+    memory. Files over the per-file budget are reported and left untouched.
+
+    Returns:
+        Tuple of (files_processed, files_cleaned, total_removed, files_skipped)
+    """
+    files_processed = 0
+    files_cleaned = 0
+    total_removed = 0
+    files_skipped = 0
+    staged_plans = []
+
+    plans = iter_plans(story_files, dry_run, jobs, budget)
+    try:
+        for plan in plans:
+            files_processed += 1
+            story_trace.record_read(plan['path'], plan['size'])
+            if plan['skipped']:
+                files_skipped += 1
+                print(f"🔴 Skipped {Path(plan['path']).name}: {plan['skipped']}")
+                continue
+            if plan['staged'] is not None:
+                staged_plans.append(plan)
+            if plan['removed'] == 0:
+                continue
+            files_cleaned += 1
+            total_removed += plan['removed']
+
+            if dry_run:
+                print(f"Would remove {plan['removed']} repetitions from {Path(plan['path']).name}")
+                for line in plan['preview']:
+                    print(line)
+    except BaseException:
+        plans.close()  # Discards plans still in flight in worker processes
+        discard_staged(staged_plans)
+        raise
+
+    if staged_plans:
+        manifest_path = commit_rewrites(staged_plans)
+        # Only report removals once the transaction has committed
+        for plan in staged_plans:
+            print(f"✓ Removed {plan['removed']} repetitions from {Path(plan['path']).name}")
+            for line in plan['preview']:
+                print(line)
+        print(f"\n✓ Committed {len(staged_plans)} files (rollback manifest: {manifest_path})")
+        pruned = prune_transactions(keep_transactions)
+        if pruned:
+            print(f"✓ Pruned {pruned} old transactions (keeping {keep_transactions})")
+
+    return files_processed, files_cleaned, total_removed, files_skipped
 
 
 def main():
@@ -88,45 +462,70 @@ def main():
     parser.add_argument('--epic', type=int, help='Clean only specified epic')
     parser.add_argument('--all', action='store_true', help='Clean all story files')
     parser.add_argument('--dry-run', action='store_true', help='Preview changes without modifying files')
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help='Number of worker processes used to compute rewrites (default: 1)')
+    parser.add_argument('--rollback', metavar='MANIFEST',
+                        help='Restore files from a previous run\'s manifest.json')
+    parser.add_argument('--keep-transactions', type=int, default=DEFAULT_KEEP_TRANSACTIONS, metavar='N',
+                        help=f'Finished transactions kept for --rollback; older ones are deleted '
+                             f'after each commit (default: {DEFAULT_KEEP_TRANSACTIONS})')
+    add_budget_arguments(parser)
 
     args = parser.parse_args()
+    story_trace.start('clean-repetitions', epic=args.epic)
 
-    if not args.epic and not args.all:
-        print("Error: Must specify --epic N or --all")
+    if not args.epic and not args.all and not args.rollback:
+        print("Error: Must specify --epic N, --all or --rollback MANIFEST")
         sys.exit(1)
 
+    # Resolve the manifest before changing directory
+    manifest_path = Path(args.rollback).resolve() if args.rollback else None
+
     # Change to project root
     project_root = Path(__file__).parent.parent.parent
     os.chdir(project_root)
 
+    if manifest_path:
+        if not manifest_path.exists():
+            print(f"❌ Manifest not found: {manifest_path}")
+            sys.exit(1)
+        restored = rollback(manifest_path)
+        print(f"\n✅ Restored {restored} files")
+        return
+
     if not STORY_DIR.exists():
         print(f"❌ Story directory not found: {STORY_DIR}")
         sys.exit(1)
 
-    # Get story files to process
+    # Stream story files to process (sorted via external merge, constant memory)
     if args.epic:
-        story_files = sorted(STORY_DIR.glob(f"{args.epic}-*.md"))
-        print(f"🧹 Cleaning Epic {args.epic} stories ({len(story_files)} files)\n")
+        story_files = iter_sorted_story_files(STORY_DIR, lambda name: name.startswith(f"{args.epic}-"))
+        print(f"🧹 Cleaning Epic {args.epic} stories\n")
     else:
-        story_files = sorted(STORY_DIR.glob("[0-9]*.md"))
-        print(f"🧹 Cleaning all story files ({len(story_files)} files)\n")
+        story_files = iter_sorted_story_files(STORY_DIR, lambda name: name[:1].isdigit())
+        print("🧹 Cleaning all story files\n")
+
+    # Archived stories are finished and stay packed
+    archived_count = sum(1 for story_id in StoryPack(str(STORY_DIR)).index
+                         if (story_id.startswith(f"{args.epic}-") if args.epic else story_id[:1].isdigit()))
+    if archived_count:
+        print(f"📦 Skipping {archived_count} archived stories\n")
 
     if args.dry_run:
         print("[DRY RUN MODE - No files will be modified]\n")
 
-    total_removed = 0
-    files_cleaned = 0
-
-    for filepath in story_files:
-        removed = clean_repetitions(filepath, args.dry_run)
-        if removed > 0:
-            files_cleaned += 1
-            total_removed += removed
+    budget = FileBudget(args.max_file_bytes, args.max_check_seconds)
+    files_processed, files_cleaned, total_removed, files_skipped = clean_batch(
+        story_files, args.dry_run, max(1, args.jobs), budget, args.keep_transactions
+    )
 
     print(f"\n{'[DRY RUN] ' if args.dry_run else ''}Summary:")
-    print(f"Files processed: {len(story_files)}")
+    print(f"Files processed: {files_processed}")
     print(f"Files with repetitions: {files_cleaned}")
     print(f"Total repetitions removed: {total_removed}")
+    if files_skipped:
+        print(f"Files skipped (over budget): {files_skipped} 🔴")
+        print("Raise --max-file-bytes / --max-check-seconds (0 = unlimited) to clean them")
 
     if args.dry_run:
         print("\nRun without --dry-run to actually modify files")
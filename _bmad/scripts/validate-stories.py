@@ -8,6 +8,13 @@ Usage:
   python validate-stories.py --epic 7           # Validate Epic 7 only
   python validate-stories.py --fix-checkboxes   # Auto-uncheck all boxes (DANGEROUS)
   python validate-stories.py --verbose          # Show detailed output
+  python validate-stories.py --changed src/server/routes/ndas.ts   # Only stories touching these paths
+  git diff --name-only main | python validate-stories.py --changed-from -
+  python validate-stories.py --analytics        # Per-epic metric percentiles and outliers (needs numpy)
+  python validate-stories.py --include-archived # Also validate stories in the archive pack
+  python validate-stories.py --sample 30        # Estimate error rates from 30 stories (stratified by epic)
+  python validate-stories.py --sample-fraction 0.1 --escalate-threshold 0.5   # Full scan of bad epics
+  python validate-stories.py --max-file-bytes 524288 --max-check-seconds 1   # Tighter per-file budgets
 
 Exit codes:
   0 = All stories valid
@@ -17,16 +24,29 @@ Exit codes:
 import os
 import sys
 import re
+import math
+import random
 import argparse
+from array import array
 from pathlib import Path
 from typing import List, Tuple, Dict
 from collections import defaultdict
 
+# Shared helpers live in scripts/lib
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent / 'scripts' / 'lib'))
+from story_archive import PackIndexError, StoryPack  # noqa: E402
+from story_impact import load_impacted_stories, read_changed_paths  # noqa: E402
+from story_stream import OnlineStats, iter_sorted_story_files, iter_story_files  # noqa: E402
+from story_budget import BudgetExceeded, FileBudget, add_budget_arguments  # noqa: E402
+from story_paragraphs import ParagraphCounter, iter_paragraphs  # noqa: E402
+import story_trace  # noqa: E402
+
 # Validation thresholds
 MIN_FILE_SIZE = 10 * 1024  # 10KB
 RECOMMENDED_SIZE = 15 * 1024  # 15KB
 MAX_REPETITIONS = 3  # Same paragraph appearing more than this is suspicious
 MIN_TASKS = 20  # Minimum number of task checkboxes
+MAX_REPORTED_ERRORS = 20  # Errors kept per severity for the report (all are counted)
 
 # Common template placeholders that should be filled in
 TEMPLATE_PLACEHOLDERS = [
@@ -37,6 +57,25 @@ TEMPLATE_PLACEHOLDERS = [
     "FIXME",
 ]
 
+# Analytics: Tukey fence multiplier and minimum stories per epic to judge outliers
+OUTLIER_IQR_MULTIPLIER = 1.5
+MIN_EPIC_STORIES_FOR_OUTLIERS = 4
+
+# Per-story metrics collected for --analytics (column order)
+ANALYTICS_METRICS = [
+    'bytes',
+    'checkbox_total',
+    'checked_ratio',
+    'ac_count',
+    'section_count',
+    'repetition_score',
+]
+
+# Sampling: default seed (runs are reproducible) and z-score for 95% confidence intervals
+DEFAULT_SAMPLE_SEED = 1
+SAMPLE_CONFIDENCE_Z = 1.96
+SAMPLE_SEVERITIES = ['critical', 'warning', 'any']
+
 # Story file location
 STORY_DIR = Path("_bmad-output/implementation-artifacts/sprint-artifacts")
 
@@ -52,107 +91,187 @@ class ValidationError:
         return f"{icon} {self.story_file}: {self.message}"
 
 
-def validate_story_file(filepath: Path) -> List[ValidationError]:
-    """Validate a single story file"""
-    errors = []
-    filename = filepath.name
-
+def validate_story_file(filepath: Path, budget: FileBudget = None) -> List[ValidationError]:
+    """Validate a single story file (oversized files get a partial verdict)"""
+    budget = budget or FileBudget()
     try:
+        file_size = filepath.stat().st_size
+        if budget.oversized(file_size):
+            prefix = budget.read_prefix(filepath)
+            story_trace.record_read(filepath, len(prefix))
+            return validate_oversized(filepath.name, prefix.decode('utf-8', errors='ignore'), file_size, budget)
+
         with open(filepath, 'r', encoding='utf-8') as f:
             content = f.read()
-            lines = content.split('\n')
     except Exception as e:
-        errors.append(ValidationError(
-            filename, "critical", f"Failed to read file: {e}"
-        ))
-        return errors
+        return [ValidationError(
+            filepath.name, "critical", f"Failed to read file: {e}"
+        )]
+
+    story_trace.record_read(filepath, file_size)
+    return validate_story_content(filepath.name, content, file_size, budget)
+
+
+def validate_oversized(filename: str, prefix: str, file_size: int, budget: FileBudget) -> List[ValidationError]:
+    """
+    Partial verdict for a file over the read budget
+
+    Only the repetition check runs, on the first max_bytes of the file -
+    runaway files are almost always copy-paste loops, so it shows why.
+    """
+    errors = [ValidationError(
+        filename, "critical",
+        f"Oversized/pathological file: {file_size} bytes exceeds the {budget.max_bytes} byte read budget "
+        f"(partial validation: repetition check on the first {budget.max_bytes} bytes only)"
+    )]
+    try:
+        budget.start("repetition")
+        errors.extend(check_repetitions(filename, prefix, budget))
+        budget.finish()
+    except BudgetExceeded as e:
+        errors.append(ValidationError(filename, "critical", f"Oversized/pathological file: {e}"))
+    return errors
 
-    # Check 1: File size
-    file_size = filepath.stat().st_size
-    if file_size < MIN_FILE_SIZE:
-        errors.append(ValidationError(
-            filename, "critical",
-            f"File too small: {file_size} bytes (minimum: {MIN_FILE_SIZE} bytes)"
-        ))
-    elif file_size < RECOMMENDED_SIZE:
-        errors.append(ValidationError(
-            filename, "warning",
-            f"File below recommended size: {file_size} bytes (recommended: {RECOMMENDED_SIZE} bytes)"
-        ))
 
-    # Check 2: Repetitive content (copy-paste loops)
-    paragraphs = [p.strip() for p in content.split('\n\n') if len(p.strip()) > 50]
-    paragraph_counts = defaultdict(int)
-    for para in paragraphs:
-        paragraph_counts[para] += 1
+def count_paragraphs(content: str, budget: FileBudget = None) -> ParagraphCounter:
+    """Count substantial paragraphs (>50 chars once stripped) by fingerprint"""
+    paragraph_counts = ParagraphCounter()
+    for para in iter_paragraphs([content]):
+        if budget is not None:
+            budget.tick()
+        para = para.strip()
+        if len(para) > 50:
+            paragraph_counts.add(para)
+    return paragraph_counts
+
 
-    for para, count in paragraph_counts.items():
+def check_repetitions(filename: str, content: str, budget: FileBudget) -> List[ValidationError]:
+    """Flag substantial paragraphs repeated more than MAX_REPETITIONS times"""
+    errors = []
+    for para, count in count_paragraphs(content, budget).items():
         if count > MAX_REPETITIONS:
             preview = para[:80] + "..." if len(para) > 80 else para
             errors.append(ValidationError(
                 filename, "critical",
                 f"Repetitive content: paragraph appears {count} times: \"{preview}\""
             ))
+    return errors
 
-    # Check 3: Task checkboxes
-    checked_boxes = content.count('- [x]') + content.count('- [X]')
-    unchecked_boxes = content.count('- [ ]')
-    total_boxes = checked_boxes + unchecked_boxes
 
-    if total_boxes == 0:
+def validate_story_content(filename: str, content: str, file_size: int,
+                           budget: FileBudget = None) -> List[ValidationError]:
+    """
+    Validate a story's content (from an active file or the archive pack)
+
+    Each check runs under the budget's CPU limit; if one runs over, the
+    remaining checks are skipped and a critical error is added instead.
+    """
+    budget = budget or FileBudget()
+    errors = []
+
+    if budget.oversized(file_size):
+        return validate_oversized(filename, content[:budget.max_bytes], file_size, budget)
+
+    # Check 1: File size
+    if file_size < MIN_FILE_SIZE:
         errors.append(ValidationError(
             filename, "critical",
-            "No task checkboxes found (should have 40-80 tasks)"
+            f"File too small: {file_size} bytes (minimum: {MIN_FILE_SIZE} bytes)"
         ))
-    elif total_boxes < MIN_TASKS:
+    elif file_size < RECOMMENDED_SIZE:
         errors.append(ValidationError(
             filename, "warning",
-            f"Too few tasks: {total_boxes} (recommended: 40-80)"
+            f"File below recommended size: {file_size} bytes (recommended: {RECOMMENDED_SIZE} bytes)"
         ))
 
-    if checked_boxes > 0:
-        ratio = (checked_boxes / total_boxes) * 100 if total_boxes > 0 else 0
-        errors.append(ValidationError(
-            filename, "critical",
-            f"Found {checked_boxes} checked boxes (all should be unchecked [ ]). {ratio:.1f}% of tasks incorrectly marked complete."
-        ))
+    try:
+        # Check 2: Repetitive content (copy-paste loops)
+        budget.start("repetition")
+        errors.extend(check_repetitions(filename, content, budget))
 
-    # Check 4: Template placeholders not filled in
-    for placeholder in TEMPLATE_PLACEHOLDERS:
-        if placeholder in content:
+        # Check 3: Task checkboxes
+        budget.start("checkbox")
+        checked_boxes = content.count('- [x]') + content.count('- [X]')
+        unchecked_boxes = content.count('- [ ]')
+        total_boxes = checked_boxes + unchecked_boxes
+
+        if total_boxes == 0:
+            errors.append(ValidationError(
+                filename, "critical",
+                "No task checkboxes found (should have 40-80 tasks)"
+            ))
+        elif total_boxes < MIN_TASKS:
             errors.append(ValidationError(
                 filename, "warning",
-                f"Template placeholder not filled: \"{placeholder}\""
+                f"Too few tasks: {total_boxes} (recommended: 40-80)"
             ))
 
-    # Check 5: Story structure (has required sections)
-    required_sections = [
-        "## Story",
-        "## Acceptance Criteria",
-        "## Tasks",
-        "## Dev Notes",
-    ]
-    for section in required_sections:
-        if section not in content:
+        if checked_boxes > 0:
+            ratio = (checked_boxes / total_boxes) * 100 if total_boxes > 0 else 0
             errors.append(ValidationError(
                 filename, "critical",
-                f"Missing required section: {section}"
+                f"Found {checked_boxes} checked boxes (all should be unchecked [ ]). {ratio:.1f}% of tasks incorrectly marked complete."
             ))
 
-    # Check 6: Acceptance criteria quality
-    ac_count = len(re.findall(r'\*\*Given\*\*|\*\*When\*\*|\*\*Then\*\*', content))
-    if ac_count < 5:
+        # Check 4: Template placeholders not filled in
+        budget.start("placeholder")
+        for placeholder in TEMPLATE_PLACEHOLDERS:
+            if placeholder in content:
+                errors.append(ValidationError(
+                    filename, "warning",
+                    f"Template placeholder not filled: \"{placeholder}\""
+                ))
+
+        # Check 5: Story structure (has required sections)
+        budget.start("structure")
+        required_sections = [
+            "## Story",
+            "## Acceptance Criteria",
+            "## Tasks",
+            "## Dev Notes",
+        ]
+        for section in required_sections:
+            if section not in content:
+                errors.append(ValidationError(
+                    filename, "critical",
+                    f"Missing required section: {section}"
+                ))
+
+        # Check 6: Acceptance criteria quality
+        budget.start("acceptance-criteria")
+        ac_count = len(re.findall(r'\*\*Given\*\*|\*\*When\*\*|\*\*Then\*\*', content))
+        if ac_count < 5:
+            errors.append(ValidationError(
+                filename, "warning",
+                f"Too few acceptance criteria: {ac_count // 3} (recommended: 5-7)"
+            ))
+        budget.finish()
+    except BudgetExceeded as e:
         errors.append(ValidationError(
-            filename, "warning",
-            f"Too few acceptance criteria: {ac_count // 3} (recommended: 5-7)"
+            filename, "critical",
+            f"Oversized/pathological file: {e} (partial validation, remaining checks skipped)"
         ))
 
     return errors
 
 
-def validate_all_stories(epic_filter: int = None, verbose: bool = False) -> Tuple[List[ValidationError], Dict]:
-    """Validate all story files, optionally filtered by epic"""
-    all_errors = []
+def validate_all_stories(epic_filter: int = None, verbose: bool = False,
+                         only_stories: set = None,
+                         include_archived: bool = False,
+                         budget: FileBudget = None) -> Tuple[List[ValidationError], Dict]:
+    """
+    Validate all story files, optionally filtered by epic and/or a set of story ids
+
+    Files are streamed, so memory stays flat regardless of corpus size. The
+    returned error list holds at most MAX_REPORTED_ERRORS per severity; the
+    full counts are in stats.
+
+    Archived stories are only counted (from the pack index) unless
+    include_archived is set, in which case each is decompressed and validated.
+
+    Files over the budget's byte or per-check CPU limit get a partial
+    verdict with a critical "oversized/pathological" error.
+    """
     stats = {
         'total_files': 0,
         'valid_files': 0,
@@ -161,61 +280,486 @@ def validate_all_stories(epic_filter: int = None, verbose: bool = False) -> Tupl
         'warnings': 0,
         'total_size': 0,
         'avg_size': 0,
+        'archived_files': 0,
     }
 
     if not STORY_DIR.exists():
         print(f"❌ Story directory not found: {STORY_DIR}")
-        return all_errors, stats
-
-    # Get all .md files
-    story_files = sorted(STORY_DIR.glob("[0-9]*.md"))
-
-    # Filter by epic if specified
-    if epic_filter is not None:
-        story_files = [f for f in story_files if f.name.startswith(f"{epic_filter}-")]
-
-    for filepath in story_files:
+        return [], stats
+
+    def in_scope(story_id):
+        return ((epic_filter is None or story_id.startswith(f"{epic_filter}-")) and
+                (only_stories is None or story_id in only_stories))
+
+    # Stream story files in name order (external merge sort keeps memory flat)
+    story_files = iter_sorted_story_files(
+        STORY_DIR, lambda name: name[:1].isdigit() and in_scope(name[:-3])
+    )
+
+    pack = StoryPack(str(STORY_DIR))
+    archived_ids = sorted(story_id for story_id in pack.index
+                          if story_id[:1].isdigit() and in_scope(story_id)
+                          and not (STORY_DIR / f"{story_id}.md").exists())
+    stats['archived_files'] = len(archived_ids)
+
+    def iter_results():
+        for filepath in story_files:
+            yield filepath.name, filepath.stat().st_size, validate_story_file(filepath, budget)
+        if include_archived:
+            for story_id in archived_ids:
+                name = f"{story_id}.md (archived)"
+                size = pack.index[story_id]['size']
+                story_trace.record_read(pack.pack_path, pack.index[story_id]['length'])
+                yield name, size, validate_story_content(name, pack.read(story_id), size, budget)
+
+    # Only the first MAX_REPORTED_ERRORS per severity are kept; the rest are counted
+    reported = {'critical': [], 'warning': []}
+    sizes = OnlineStats()
+
+    for filename, file_size, errors in iter_results():
         stats['total_files'] += 1
-        stats['total_size'] += filepath.stat().st_size
-
-        errors = validate_story_file(filepath)
+        sizes.add(file_size)
 
         if errors:
             stats['files_with_errors'] += 1
-            all_errors.extend(errors)
 
             for error in errors:
                 if error.severity == "critical":
                     stats['critical_errors'] += 1
                 elif error.severity == "warning":
                     stats['warnings'] += 1
+                kept = reported.get(error.severity)
+                if kept is not None and len(kept) < MAX_REPORTED_ERRORS:
+                    kept.append(error)
         else:
             stats['valid_files'] += 1
 
         if verbose and errors:
-            print(f"\n{filepath.name}:")
+            print(f"\n{filename}:")
             for error in errors:
                 print(f"  {error}")
 
-    if stats['total_files'] > 0:
-        stats['avg_size'] = stats['total_size'] // stats['total_files']
+    stats['total_size'] = int(sizes.total)
+    stats['avg_size'] = int(sizes.mean)
+
+    return reported['critical'] + reported['warning'], stats
+
+
+def story_metrics(content: str, file_size: int, budget: FileBudget = None) -> Dict[str, float]:
+    """
+    Compute the per-story metrics used by --analytics
+
+    repetition_score is the fraction of substantial paragraphs (>50 chars)
+    that repeat an earlier paragraph. The paragraph scan ticks the budget's
+    current check, if one is given.
+    """
+    paragraph_counts = count_paragraphs(content, budget)
+    substantial = sum(count for _, count in paragraph_counts.items())
+    repeated = substantial - len(paragraph_counts)
+
+    checked_boxes = content.count('- [x]') + content.count('- [X]')
+    total_boxes = checked_boxes + content.count('- [ ]')
+
+    return {
+        'bytes': file_size,
+        'checkbox_total': total_boxes,
+        'checked_ratio': checked_boxes / total_boxes if total_boxes else 0.0,
+        'ac_count': len(re.findall(r'\*\*Given\*\*|\*\*When\*\*|\*\*Then\*\*', content)) // 3,
+        'section_count': len(re.findall(r'^## ', content, re.MULTILINE)),
+        'repetition_score': repeated / substantial if substantial else 0.0,
+    }
+
+
+def _grouped_percentiles(group, values, n_groups: int, quantiles: List[float]):
+    """
+    Percentiles of `values` within each group, computed for all groups at once
+
+    Sorts by (group, value), then linearly interpolates each group's quantile
+    positions inside its slice of the sorted array.
+
+    Returns:
+        Array of shape (n_groups, len(quantiles))
+    """
+    import numpy as np
+
+    order = np.lexsort((values, group))
+    sorted_values = values[order].astype(float)
+    counts = np.bincount(group, minlength=n_groups)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+    q = np.asarray(quantiles, dtype=float)
+    pos = starts[:, None] + q[None, :] * np.maximum(counts - 1, 0)[:, None]
+    lo = np.floor(pos).astype(np.int64)
+    hi = np.ceil(pos).astype(np.int64)
+    frac = pos - lo
+
+    lo = np.clip(lo, 0, len(sorted_values) - 1)
+    hi = np.clip(hi, 0, len(sorted_values) - 1)
+    return sorted_values[lo] * (1 - frac) + sorted_values[hi] * frac
+
+
+def analyze_corpus(epic_filter: int = None, only_stories: set = None,
+                   budget: FileBudget = None) -> Dict:
+    """
+    Build columnar per-story metrics and flag per-epic statistical outliers
+
+    Outliers are judged against each story's own epic rather than fixed global
+    thresholds: a metric is flagged when it falls outside the epic's Tukey
+    fences (p25 − OUTLIER_IQR_MULTIPLIER × IQR, p75 + OUTLIER_IQR_MULTIPLIER × IQR).
+
+    Files over the budget's byte limit are not read, and files whose metrics
+    run over its CPU limit are dropped; both are listed as pathological
+    instead of skewing their epic's percentiles.
+
+    Returns:
+        Dict with 'epics' (per-epic percentiles), 'outliers' and
+        'pathological' ([(story, reason)])
+    """
+    budget = budget or FileBudget()
+    try:
+        import numpy as np
+    except ImportError:
+        print("❌ --analytics requires numpy (pip install numpy)")
+        sys.exit(1)
+
+    def in_scope(name):
+        story_id = name[:-3]
+        return (name[:1].isdigit() and
+                (epic_filter is None or story_id.startswith(f"{epic_filter}-")) and
+                (only_stories is None or story_id in only_stories))
+
+    names = []
+    epics = []
+    # Compact typed columns, grown while streaming the directory
+    columns = [array('d') for _ in ANALYTICS_METRICS]
+    pathological = []
+
+    for filepath in iter_sorted_story_files(STORY_DIR, in_scope):
+        try:
+            file_size = filepath.stat().st_size
+            if budget.oversized(file_size):
+                pathological.append((filepath.stem, f"{file_size} bytes exceeds the "
+                                                     f"{budget.max_bytes} byte read budget"))
+                continue
+            content = filepath.read_text(encoding='utf-8')
+        except Exception as e:
+            print(f"⚠️  Skipping {filepath.name}: {e}")
+            continue
+        story_trace.record_read(filepath, file_size)
+
+        try:
+            budget.start("metrics")
+            metrics = story_metrics(content, file_size, budget)
+            budget.finish()
+        except BudgetExceeded as e:
+            pathological.append((filepath.stem, str(e)))
+            continue
+        for column, metric in zip(columns, ANALYTICS_METRICS):
+            column.append(metrics[metric])
+        names.append(filepath.stem)
+        epics.append(filepath.name.split('-', 1)[0])
+
+    if not names:
+        return {'epics': {}, 'outliers': [], 'pathological': pathological}
+
+    columns = np.vstack([np.frombuffer(column, dtype=float) for column in columns])
+    epic_keys, group = np.unique(np.array(epics), return_inverse=True)
+    n_groups = len(epic_keys)
+    counts = np.bincount(group, minlength=n_groups)
+
+    summary = {str(epic): {'stories': int(counts[i])} for i, epic in enumerate(epic_keys)}
+    flags = []
+
+    for m, metric in enumerate(ANALYTICS_METRICS):
+        values = columns[m]
+        p25, p50, p75 = _grouped_percentiles(group, values, n_groups, [0.25, 0.5, 0.75]).T
+
+        for i, epic in enumerate(epic_keys):
+            summary[str(epic)][metric] = (float(p25[i]), float(p50[i]), float(p75[i]))
+
+        # Floor the IQR at 10% of the median so tightly clustered epics
+        # don't flag every small deviation
+        iqr = np.maximum(p75 - p25, 0.1 * np.abs(p50))
+        lower = (p25 - OUTLIER_IQR_MULTIPLIER * iqr)[group]
+        upper = (p75 + OUTLIER_IQR_MULTIPLIER * iqr)[group]
+        judged = counts[group] >= MIN_EPIC_STORIES_FOR_OUTLIERS
+
+        for direction, mask in (('low', judged & (values < lower)), ('high', judged & (values > upper))):
+            for idx in np.flatnonzero(mask):
+                flags.append({
+                    'story': names[idx],
+                    'epic': str(epic_keys[group[idx]]),
+                    'metric': metric,
+                    'direction': direction,
+                    'value': float(values[idx]),
+                    'epic_median': float(p50[group[idx]]),
+                })
+
+    flags.sort(key=lambda f: (f['story'], f['metric']))
+    return {'epics': summary, 'outliers': flags, 'pathological': pathological}
+
+
+def story_epic_key(name: str) -> str:
+    """Epic of a story file name (e.g. "7" for "7-2-foo.md")"""
+    return name.split('-', 1)[0]
+
+
+def epic_sort_key(epic: str):
+    """Sort epics numerically, lettered epics last"""
+    return (0, int(epic)) if epic.isdigit() else (1, epic)
+
+
+def print_analytics(result: Dict):
+    """Print per-epic percentiles and flagged outliers"""
+    print("="*78)
+    print("CORPUS ANALYTICS (per-epic p25 / median / p75)")
+    print("="*78)
+    print(f"{'Epic':<6}{'Stories':>8}{'Size KB':>20}{'Checkboxes':>16}{'Checked %':>11}{'ACs':>8}{'Repeat %':>9}")
+    for epic in sorted(result['epics'], key=epic_sort_key):
+        row = result['epics'][epic]
+        size = '/'.join(f"{v / 1024:.0f}" for v in row['bytes'])
+        boxes = '/'.join(f"{v:.0f}" for v in row['checkbox_total'])
+        print(f"{epic:<6}{row['stories']:>8}{size:>20}{boxes:>16}"
+              f"{row['checked_ratio'][1] * 100:>10.0f}%{row['ac_count'][1]:>8.0f}"
+              f"{row['repetition_score'][1] * 100:>8.0f}%")
+    print("="*78)
+
+    if result['pathological']:
+        print(f"\n🔴 OVERSIZED/PATHOLOGICAL ({len(result['pathological'])}, excluded from percentiles):\n")
+        for story, reason in result['pathological']:
+            print(f"  {story}: {reason}")
+
+    outliers = result['outliers']
+    if not outliers:
+        print("\n✅ No per-epic outliers found")
+        return
+
+    print(f"\n⚠️  OUTLIERS ({len(outliers)}):\n")
+    for flag in outliers:
+        arrow = "↓" if flag['direction'] == 'low' else "↑"
+        print(f"  {arrow} {flag['story']}: {flag['metric']} = {flag['value']:.2f} "
+              f"(epic {flag['epic']} median {flag['epic_median']:.2f})")
+
+
+def allocate_sample(population: Dict[str, int], sample_size: int = None,
+                    sample_fraction: float = None) -> Dict[str, int]:
+    """
+    Split a sample across epics in proportion to their size
+
+    Uses largest-remainder rounding for a fixed sample_size. Every epic gets
+    at least one story (so small epics are never skipped) and no epic more
+    than it has.
+    """
+    if sample_fraction is not None:
+        quotas = {epic: count * sample_fraction for epic, count in population.items()}
+        allocation = {epic: round(quota) for epic, quota in quotas.items()}
+    else:
+        total = sum(population.values())
+        quotas = {epic: sample_size * count / total for epic, count in population.items()}
+        allocation = {epic: int(quota) for epic, quota in quotas.items()}
+        remaining = sample_size - sum(allocation.values())
+        by_remainder = sorted(sorted(quotas), key=lambda epic: quotas[epic] - allocation[epic], reverse=True)
+        for epic in by_remainder[:remaining]:
+            allocation[epic] += 1
+
+    return {epic: min(population[epic], max(1, count)) for epic, count in allocation.items()}
+
+
+def stratified_sample(epic_filter: int = None, only_stories: set = None, sample_size: int = None,
+                      sample_fraction: float = None,
+                      seed: int = DEFAULT_SAMPLE_SEED) -> Tuple[Dict[str, int], Dict[str, List[Path]]]:
+    """
+    Draw a random sample of story files, stratified by epic
+
+    Two streaming passes: the first counts stories per epic, the second
+    keeps a reservoir of each epic's allocated size. Files are visited in
+    name order, so the same seed always draws the same sample.
+
+    Returns:
+        Tuple of (epic -> stories in scope, epic -> sampled story files)
+    """
+    def in_scope(name):
+        story_id = name[:-3]
+        return (name[:1].isdigit() and
+                (epic_filter is None or story_id.startswith(f"{epic_filter}-")) and
+                (only_stories is None or story_id in only_stories))
+
+    population = defaultdict(int)
+    for filepath in iter_story_files(STORY_DIR, in_scope):
+        population[story_epic_key(filepath.name)] += 1
+    population = dict(population)
+    if not population:
+        return {}, {}
+
+    allocation = allocate_sample(population, sample_size, sample_fraction)
+    rng = random.Random(seed)
+    sample = {epic: [] for epic in allocation}
+    seen = defaultdict(int)
+
+    for filepath in iter_sorted_story_files(STORY_DIR, in_scope):
+        epic = story_epic_key(filepath.name)
+        if epic not in allocation:
+            continue  # Appeared between the two passes
+        seen[epic] += 1
+        reservoir = sample[epic]
+        if len(reservoir) < allocation[epic]:
+            reservoir.append(filepath)
+        else:
+            slot = rng.randrange(seen[epic])
+            if slot < allocation[epic]:
+                reservoir[slot] = filepath
+
+    return population, sample
+
+
+def estimate_error_rates(population: Dict[str, int], sample: Dict[str, List[Path]],
+                         budget: FileBudget = None) -> Dict:
+    """
+    Validate a stratified sample and estimate the share of files with errors
+
+    For each severity (and "any"), the corpus rate is the epic-weighted mean
+    of the sampled rates. Its confidence interval uses the stratified
+    variance with finite population correction. An epic sampled with a
+    single story (but holding more) contributes the worst-case variance.
+
+    Returns:
+        Dict with population/sampled totals, per-epic sampled rates,
+        per-severity (estimate, low, high) and the first sampled errors
+    """
+    total = sum(population.values())
+    epics = {}
+    reported = {'critical': [], 'warning': []}
+    estimates = {severity: [0.0, 0.0] for severity in SAMPLE_SEVERITIES}  # [rate, variance]
+
+    for epic, files in sample.items():
+        hits = {severity: 0 for severity in SAMPLE_SEVERITIES}
+        for filepath in files:
+            errors = validate_story_file(filepath, budget)
+            severities = {error.severity for error in errors}
+            hits['critical'] += 'critical' in severities
+            hits['warning'] += 'warning' in severities
+            hits['any'] += bool(errors)
+            for error in errors:
+                kept = reported.get(error.severity)
+                if kept is not None and len(kept) < MAX_REPORTED_ERRORS:
+                    kept.append(error)
+
+        epic_total, sampled = population[epic], len(files)
+        weight = epic_total / total
+        fpc = 1 - sampled / epic_total
+        rates = {}
+        for severity, count in hits.items():
+            rate = count / sampled
+            rates[severity] = rate
+            spread = rate * (1 - rate) / (sampled - 1) if sampled > 1 else 0.25
+            estimates[severity][0] += weight * rate
+            estimates[severity][1] += weight * weight * fpc * spread
+        epics[epic] = {'population': epic_total, 'sampled': sampled, 'rates': rates}
+
+    intervals = {}
+    for severity, (rate, variance) in estimates.items():
+        half_width = SAMPLE_CONFIDENCE_Z * math.sqrt(variance)
+        intervals[severity] = (rate, max(0.0, rate - half_width), min(1.0, rate + half_width))
+
+    return {
+        'population': total,
+        'sampled': sum(epic['sampled'] for epic in epics.values()),
+        'epics': epics,
+        'estimates': intervals,
+        'errors': reported['critical'] + reported['warning'],
+    }
+
+
+def print_sample_report(result: Dict, seed: int):
+    """Print per-epic sampled rates and the corpus-level estimates"""
+    print("="*60)
+    print(f"SAMPLED VALIDATION ({result['sampled']} of {result['population']} stories, seed {seed})")
+    print("="*60)
+    print(f"{'Epic':<6}{'Stories':>9}{'Sampled':>9}{'Critical':>11}{'Warning':>10}{'Any':>8}")
+    for epic in sorted(result['epics'], key=epic_sort_key):
+        row = result['epics'][epic]
+        rates = row['rates']
+        print(f"{epic:<6}{row['population']:>9}{row['sampled']:>9}"
+              f"{rates['critical'] * 100:>10.0f}%{rates['warning'] * 100:>9.0f}%{rates['any'] * 100:>7.0f}%")
+    print("-"*60)
+
+    labels = {'critical': 'Critical errors', 'warning': 'Warnings', 'any': 'Any error'}
+    for severity in SAMPLE_SEVERITIES:
+        rate, low, high = result['estimates'][severity]
+        print(f"{labels[severity] + ':':<17}{rate * 100:5.1f}% of files (95% CI {low * 100:.1f}-{high * 100:.1f}%)"
+              f" ≈ {round(rate * result['population'])} files")
+    print("="*60)
+
+
+def run_sample(args, only_stories: set, budget: FileBudget) -> int:
+    """
+    --sample / --sample-fraction: estimate corpus health from a stratified sample
+
+    Epics whose sampled critical rate reaches --escalate-threshold are then
+    validated in full.
+
+    Returns:
+        Exit code (1 if any validated file has critical errors)
+    """
+    population, sample = stratified_sample(args.epic, only_stories, args.sample,
+                                           args.sample_fraction, args.seed)
+    if not population:
+        print("No story files in scope")
+        return 0
 
-    return all_errors, stats
+    sampled = sum(len(files) for files in sample.values())
+    if args.sample is not None and sampled != args.sample:
+        print(f"ℹ️  Sampling {sampled} stories instead of {args.sample}: every epic gets at least one "
+              f"and none more than it has ({len(population)} epics, {sum(population.values())} stories)\n")
+
+    result = estimate_error_rates(population, sample, budget)
+    print_sample_report(result, args.seed)
+
+    critical_errors = [e for e in result['errors'] if e.severity == "critical"]
+    critical_found = bool(critical_errors)
+    if critical_errors and not args.summary:
+        print(f"\n🔴 SAMPLED CRITICAL ERRORS (first {len(critical_errors)}):\n")
+        for error in critical_errors:
+            print(f"  {error}")
+
+    if args.escalate_threshold is not None:
+        escalated = sorted((epic for epic, row in result['epics'].items()
+                            if row['sampled'] < row['population']
+                            and row['rates']['critical'] >= args.escalate_threshold), key=epic_sort_key)
+        if escalated:
+            print(f"\n🔎 Escalating to a full scan of {len(escalated)} epic(s) with sampled "
+                  f"critical rate >= {args.escalate_threshold * 100:.0f}%:\n")
+        for epic in escalated:
+            _, stats = validate_all_stories(epic, False, only_stories, False, budget)
+            print(f"  Epic {epic}: {stats['files_with_errors']}/{stats['total_files']} files with errors, "
+                  f"{stats['critical_errors']} critical errors, {stats['warnings']} warnings")
+            critical_found = critical_found or stats['critical_errors'] > 0
+
+    if critical_found:
+        print("\n❌ VALIDATION FAILED - Critical errors found in sample")
+        return 1
+    print("\n✅ No critical errors in sample")
+    return 0
 
 
 def fix_checkboxes(epic_filter: int = None, dry_run: bool = True):
     """Auto-uncheck all checkboxes in story files (DANGEROUS - use with caution)"""
-    story_files = sorted(STORY_DIR.glob("[0-9]*.md"))
-
-    if epic_filter is not None:
-        story_files = [f for f in story_files if f.name.startswith(f"{epic_filter}-")]
+    story_files = iter_sorted_story_files(
+        STORY_DIR,
+        lambda name: name[:1].isdigit() and (epic_filter is None or name.startswith(f"{epic_filter}-"))
+    )
 
     modified_count = 0
     checkbox_count = 0
+    scanned_count = 0
 
     for filepath in story_files:
+        if '-' in filepath.name:
+            scanned_count += 1
+
         with open(filepath, 'r', encoding='utf-8') as f:
             content = f.read()
+        story_trace.record_read(filepath, len(content))
 
         # Replace all [x] and [X] with [ ]
         original_content = content
@@ -230,11 +774,12 @@ def fix_checkboxes(epic_filter: int = None, dry_run: bool = True):
             else:
                 with open(filepath, 'w', encoding='utf-8') as f:
                     f.write(content)
+                story_trace.record_write(filepath, len(content))
                 print(f"✓ Unchecked {changes} boxes in {filepath.name}")
                 modified_count += 1
 
     if dry_run:
-        print(f"\n[DRY RUN] Would modify {len([f for f in story_files if '-' in f.name])} files, unchecking {checkbox_count} boxes")
+        print(f"\n[DRY RUN] Would modify {scanned_count} files, unchecking {checkbox_count} boxes")
         print("Run with --no-dry-run to actually modify files")
     else:
         print(f"\n✅ Modified {modified_count} files, unchecked {checkbox_count} total boxes")
@@ -247,9 +792,37 @@ def main():
     parser.add_argument('--fix-checkboxes', action='store_true', help='Auto-uncheck all checkboxes')
     parser.add_argument('--no-dry-run', action='store_true', help='Actually modify files (with --fix-checkboxes)')
     parser.add_argument('--summary', '-s', action='store_true', help='Show summary only')
+    parser.add_argument('--include-archived', action='store_true',
+                        help='Also validate stories in the archive pack (decompresses them)')
+    parser.add_argument('--analytics', action='store_true',
+                        help='Report per-epic metric percentiles and outliers (requires numpy)')
+    parser.add_argument('--changed', nargs='+', metavar='PATH',
+                        help='Validate only stories that reference these changed repo paths')
+    parser.add_argument('--changed-from', metavar='FILE',
+                        help="Read changed repo paths from FILE, one per line ('-' for stdin)")
+    sampling = parser.add_mutually_exclusive_group()
+    sampling.add_argument('--sample', type=int, metavar='N',
+                          help='Validate a random sample of about N stories, stratified by epic '
+                               '(every epic gets at least one, so small N can sample more)')
+    sampling.add_argument('--sample-fraction', type=float, metavar='F',
+                          help='Validate a random fraction F (0-1] of each epic')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SAMPLE_SEED,
+                        help=f'Random seed for --sample/--sample-fraction (default: {DEFAULT_SAMPLE_SEED})')
+    parser.add_argument('--escalate-threshold', type=float, metavar='RATE',
+                        help='Fully validate epics whose sampled critical rate is at least RATE (0-1)')
+    add_budget_arguments(parser)
 
     args = parser.parse_args()
 
+    if args.sample is not None and args.sample < 1:
+        parser.error('--sample must be at least 1')
+    if args.sample_fraction is not None and not 0 < args.sample_fraction <= 1:
+        parser.error('--sample-fraction must be in (0, 1]')
+    story_trace.start('validate-stories', epic=args.epic)
+
+    # Read changed paths before changing directory
+    changed_paths = read_changed_paths(args.changed, args.changed_from)
+
     # Change to project root
     project_root = Path(__file__).parent.parent.parent
     os.chdir(project_root)
@@ -263,7 +836,21 @@ def main():
     if args.epic:
         print(f"Validating Epic {args.epic} stories only...\n")
 
-    errors, stats = validate_all_stories(args.epic, args.verbose)
+    only_stories = None
+    if args.changed or args.changed_from:
+        only_stories = load_impacted_stories(str(STORY_DIR), changed_paths)
+        print(f"Validating {len(only_stories)} stories impacted by {len(changed_paths)} changed paths...\n")
+
+    budget = FileBudget(args.max_file_bytes, args.max_check_seconds)
+
+    if args.analytics:
+        print_analytics(analyze_corpus(args.epic, only_stories, budget))
+        return
+
+    if args.sample is not None or args.sample_fraction is not None:
+        sys.exit(run_sample(args, only_stories, budget))
+
+    errors, stats = validate_all_stories(args.epic, args.verbose, only_stories, args.include_archived, budget)
 
     # Print summary
     print("\n" + "="*60)
@@ -275,6 +862,8 @@ def main():
     print(f"Critical errors:         {stats['critical_errors']} 🔴")
     print(f"Warnings:                {stats['warnings']} ⚠️")
     print(f"Average file size:       {stats['avg_size'] // 1024}KB")
+    if stats['archived_files'] and not args.include_archived:
+        print(f"Archived (not scanned):  {stats['archived_files']} 📦")
     print("="*60)
 
     # Group errors by severity
@@ -282,18 +871,18 @@ def main():
     warnings = [e for e in errors if e.severity == "warning"]
 
     if critical_errors and not args.summary:
-        print(f"\n🔴 CRITICAL ERRORS ({len(critical_errors)}):\n")
-        for error in critical_errors[:20]:  # Show first 20
+        print(f"\n🔴 CRITICAL ERRORS ({stats['critical_errors']}):\n")
+        for error in critical_errors:  # Show first MAX_REPORTED_ERRORS
             print(f"  {error}")
-        if len(critical_errors) > 20:
-            print(f"  ... and {len(critical_errors) - 20} more critical errors")
+        if stats['critical_errors'] > len(critical_errors):
+            print(f"  ... and {stats['critical_errors'] - len(critical_errors)} more critical errors")
 
     if warnings and not args.summary and args.verbose:
-        print(f"\n⚠️  WARNINGS ({len(warnings)}):\n")
-        for error in warnings[:20]:
+        print(f"\n⚠️  WARNINGS ({stats['warnings']}):\n")
+        for error in warnings:
             print(f"  {error}")
-        if len(warnings) > 20:
-            print(f"  ... and {len(warnings) - 20} more warnings")
+        if stats['warnings'] > len(warnings):
+            print(f"  ... and {stats['warnings'] - len(warnings)} more warnings")
 
     # Exit code
     if stats['critical_errors'] > 0:
@@ -308,4 +897,8 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    try:
+        main()
+    except PackIndexError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
@@ -8,10 +8,14 @@ import re
 from pathlib import Path
 from typing import Dict
 
+from story_stream import iter_sorted_story_files
+import story_trace
+
 def load_sprint_status(path: str = "_bmad-output/implementation-artifacts/sprint-artifacts/sprint-status.yaml") -> Dict[str, str]:
     """Load story statuses from sprint-status.yaml"""
     with open(path) as f:
         lines = f.readlines()
+    story_trace.record_read(path, sum(len(line) for line in lines))
 
     statuses = {}
     in_dev_status = False
@@ -37,6 +41,7 @@ def load_sprint_status(path: str = "_bmad-output/implementation-artifacts/sprint
 def add_status_to_story(story_file: Path, status: str) -> bool:
     """Add Status field to story file if missing"""
     content = story_file.read_text()
+    story_trace.record_read(story_file, len(content))
 
     # Check if Status field already exists (handles both "Status:" and "**Status:**")
     if re.search(r'^\*?\*?Status:', content, re.MULTILINE | re.IGNORECASE):
@@ -67,10 +72,13 @@ def add_status_to_story(story_file: Path, status: str) -> bool:
     lines.insert(insert_idx + 2, '')
 
     # Write back
-    story_file.write_text('\n'.join(lines))
+    new_content = '\n'.join(lines)
+    story_file.write_text(new_content)
+    story_trace.record_write(story_file, len(new_content))
     return True
 
 def main():
+    story_trace.start('add-status-fields')
     story_dir = Path("_bmad-output/implementation-artifacts/sprint-artifacts")
     statuses = load_sprint_status()
 
@@ -78,7 +86,7 @@ def main():
     skipped = 0
     missing = 0
 
-    for story_file in sorted(story_dir.glob("*.md")):
+    for story_file in iter_sorted_story_files(story_dir):
         story_id = story_file.stem
 
         # Skip special files
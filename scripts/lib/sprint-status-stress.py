@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Sprint Status Stress Harness - Concurrent load test for sprint-status-updater.py
+
+Simulates several autonomous agents running `sprint-status-updater.py --mode fix`
+at the same time. A synthetic sprint-status.yaml and story directory are
+generated in a temp directory; each agent owns a disjoint set of stories and,
+every round, advances one story's Status: field and runs the updater.
+
+Measured:
+  - Throughput (updater runs per second) and latency percentiles
+  - Read-your-writes misses: an agent's update absent right after its own run
+  - Lost updates: stories whose final YAML status differs from the story file
+  - Corruption: missing, duplicated or unparseable development_status entries
+
+Usage:
+  python sprint-status-stress.py                          # 4 agents x 10 rounds
+  python sprint-status-stress.py --agents 8 --rounds 25   # Heavier load
+  python sprint-status-stress.py --json report.json       # Also write a JSON report
+
+Exit codes:
+  0 = No lost updates or corruption
+  1 = Lost updates or corruption detected
+"""
+
+import os
+import re
+import sys
+import json
+import math
+import time
+import shutil
+import tempfile
+import argparse
+import subprocess
+from pathlib import Path
+from typing import Dict, List
+from concurrent.futures import ThreadPoolExecutor
+
+UPDATER = Path(__file__).resolve().parent / 'sprint-status-updater.py'
+
+# Status sequence each story moves through, one step per round
+STATUS_CYCLE = ['in-progress', 'review', 'done', 'in-progress', 'review', 'done']
+
+
+def build_fixture(root: Path, epics: int, stories_per_epic: int) -> List[str]:
+    """Write a synthetic sprint-status.yaml and story directory; return story ids"""
+    story_dir = root / 'stories'
+    story_dir.mkdir()
+
+    story_ids = []
+    lines = [
+        '# Sprint Status Tracking - stress fixture',
+        '# last_verified: never',
+        '',
+        'development_status:',
+    ]
+    for epic in range(1, epics + 1):
+        lines.append(f'  # Epic {epic}')
+        lines.append(f'  epic-{epic}: in-progress')
+        for story in range(1, stories_per_epic + 1):
+            story_id = f'{epic}-{story}-stress-story'
+            story_ids.append(story_id)
+            lines.append(f'  {story_id}: ready-for-dev')
+            write_story(story_dir, story_id, 'ready-for-dev')
+        lines.append('')
+
+    (root / 'sprint-status.yaml').write_text('\n'.join(lines))
+    return story_ids
+
+
+def write_story(story_dir: Path, story_id: str, status: str):
+    """Atomically (re)write a synthetic story file with the given status"""
+    story_file = story_dir / f'{story_id}.md'
+    tmp_file = story_dir / f'.{story_id}.tmp'
+    tmp_file.write_text(f'# Story {story_id}\n\nStatus: {status}\n\n## Story\n\nStress fixture.\n')
+    os.replace(tmp_file, story_file)
+
+
+def read_yaml_statuses(path: Path) -> Dict[str, List[str]]:
+    """Parse development_status into key -> [statuses] (more than one = duplicate)"""
+    entries: Dict[str, List[str]] = {}
+    in_dev_status = False
+    try:
+        text = path.read_text()
+    except OSError:
+        return entries
+
+    for line in text.split('\n'):
+        if line.strip() == 'development_status:':
+            in_dev_status = True
+            continue
+        if in_dev_status:
+            match = re.match(r'\s+([a-zA-Z0-9-]+):\s*([^\s#]+)', line)
+            if match:
+                entries.setdefault(match.group(1), []).append(match.group(2))
+    return entries
+
+
+def run_agent(agent: int, root: Path, story_ids: List[str], rounds: int) -> dict:
+    """One simulated agent: advance a story, run the updater, check own write"""
+    story_dir = root / 'stories'
+    sprint_status = root / 'sprint-status.yaml'
+    latencies = []
+    misses = 0
+    failures = 0
+    expected = {}
+
+    for round_num in range(rounds):
+        story_id = story_ids[round_num % len(story_ids)]
+        status = STATUS_CYCLE[(round_num // len(story_ids)) % len(STATUS_CYCLE)]
+        write_story(story_dir, story_id, status)
+        expected[story_id] = status
+
+        start = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, str(UPDATER), '--mode', 'fix',
+             '--sprint-status', str(sprint_status), '--story-dir', str(story_dir)],
+            cwd=root, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+        )
+        latencies.append(time.perf_counter() - start)
+
+        if result.returncode != 0:
+            failures += 1
+        if read_yaml_statuses(sprint_status).get(story_id, [None])[-1] != status:
+            misses += 1
+
+    return {'agent': agent, 'latencies': latencies, 'misses': misses,
+            'failures': failures, 'expected': expected}
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(q * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def run_stress(agents: int, rounds: int, epics: int, stories_per_epic: int, keep: bool = False) -> dict:
+    """Run the harness and return the report"""
+    if agents > epics * stories_per_epic:
+        raise ValueError(f"{agents} agents need at least as many stories "
+                         f"(fixture has {epics * stories_per_epic})")
+    root = Path(tempfile.mkdtemp(prefix='sprint-status-stress-'))
+    try:
+        story_ids = build_fixture(root, epics, stories_per_epic)
+        owned = [story_ids[i::agents] for i in range(agents)]
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=agents) as executor:
+            results = list(executor.map(
+                lambda i: run_agent(i, root, owned[i], rounds), range(agents)
+            ))
+        wall_time = time.perf_counter() - start
+
+        final = read_yaml_statuses(root / 'sprint-status.yaml')
+        epic_keys = {f'epic-{e}' for e in range(1, epics + 1)}
+        missing = sorted((set(story_ids) | epic_keys) - set(final))
+        duplicated = sorted(key for key, statuses in final.items() if len(statuses) > 1)
+        unknown = sorted(set(final) - set(story_ids) - epic_keys)
+
+        lost = []
+        for result in results:
+            for story_id, status in result['expected'].items():
+                if final.get(story_id, [None])[-1] != status:
+                    lost.append(story_id)
+
+        latencies = sorted(l for result in results for l in result['latencies'])
+        runs = len(latencies)
+        report = {
+            'agents': agents,
+            'rounds': rounds,
+            'stories': len(story_ids),
+            'runs': runs,
+            'wall_time_s': round(wall_time, 3),
+            'throughput_runs_per_s': round(runs / wall_time, 2) if wall_time else 0.0,
+            'latency_s': {
+                'p50': round(percentile(latencies, 0.50), 4),
+                'p90': round(percentile(latencies, 0.90), 4),
+                'p99': round(percentile(latencies, 0.99), 4),
+                'max': round(latencies[-1], 4) if latencies else 0.0,
+            },
+            'updater_failures': sum(r['failures'] for r in results),
+            'read_your_writes_misses': sum(r['misses'] for r in results),
+            'lost_updates': sorted(lost),
+            'corruption': {'missing': missing, 'duplicated': duplicated, 'unknown': unknown},
+            'fixture': str(root) if keep else None,
+        }
+        return report
+    finally:
+        if not keep:
+            shutil.rmtree(root, ignore_errors=True)
+
+
+def print_report(report: dict):
+    corruption = report['corruption']
+    corrupt_count = sum(len(v) for v in corruption.values())
+
+    print("="*60)
+    print("SPRINT STATUS STRESS REPORT")
+    print("="*60)
+    print(f"Agents x rounds:         {report['agents']} x {report['rounds']} ({report['stories']} stories)")
+    print(f"Updater runs:            {report['runs']} in {report['wall_time_s']}s")
+    print(f"Throughput:              {report['throughput_runs_per_s']} runs/s")
+    latency = report['latency_s']
+    print(f"Latency p50/p90/p99/max: {latency['p50']}s / {latency['p90']}s / {latency['p99']}s / {latency['max']}s")
+    print(f"Updater failures:        {report['updater_failures']}")
+    print(f"Read-your-writes misses: {report['read_your_writes_misses']}")
+    print(f"Lost updates:            {len(report['lost_updates'])} {'🔴' if report['lost_updates'] else '✅'}")
+    print(f"Corrupted entries:       {corrupt_count} {'🔴' if corrupt_count else '✅'}")
+    print("="*60)
+
+    for story_id in report['lost_updates'][:20]:
+        print(f"  [LOST] {story_id}")
+    for kind, keys in corruption.items():
+        for key in keys[:20]:
+            print(f"  [{kind.upper()}] {key}")
+    if report['fixture']:
+        print(f"\nFixture kept at: {report['fixture']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Stress test concurrent sprint-status.yaml updates')
+    parser.add_argument('--agents', type=int, default=4, help='Concurrent updater processes (default: 4)')
+    parser.add_argument('--rounds', type=int, default=10, help='Updates per agent (default: 10)')
+    parser.add_argument('--epics', type=int, default=5, help='Epics in the synthetic fixture (default: 5)')
+    parser.add_argument('--stories-per-epic', type=int, default=20, help='Stories per epic (default: 20)')
+    parser.add_argument('--json', metavar='FILE', help='Also write the report as JSON')
+    parser.add_argument('--keep', action='store_true', help='Keep the fixture directory for inspection')
+    args = parser.parse_args()
+
+    if min(args.agents, args.rounds, args.epics, args.stories_per_epic) < 1:
+        print("Error: --agents, --rounds, --epics and --stories-per-epic must be at least 1")
+        sys.exit(1)
+    if args.agents > args.epics * args.stories_per_epic:
+        print(f"Error: --agents ({args.agents}) exceeds the fixture's "
+              f"{args.epics * args.stories_per_epic} stories; every agent needs a story of its own")
+        sys.exit(1)
+
+    report = run_stress(args.agents, args.rounds, args.epics, args.stories_per_epic, args.keep)
+    print_report(report)
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2))
+        print(f"\n✓ Report written: {args.json}")
+
+    corrupt = any(report['corruption'].values())
+    sys.exit(1 if report['lost_updates'] or corrupt else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -8,25 +8,91 @@ Purpose: Update sprint-status.yaml entries while preserving:
   - Section structure
   - Manual annotations
 
+Every applied transition is also appended to .sprint-status-history.tsv;
+--mode history streams that log to report burndown and cycle time per epic.
+
+--mode archive moves finished stories into the compressed story pack (see
+story_archive.py); scans and syncs read archived statuses from its index.
+
+--mode progress writes each story's checkbox counts into its comment as
+"[tasks: checked/total]", recounting only files that changed (see
+story_progress.py).
+
+Runs that may write hold an exclusive lock on sprint-status.yaml.lock from
+load to save, and saves replace the file atomically, so concurrent agents
+neither read a half-written file nor overwrite each other's updates.
+
+--mode reconcile compares the set of YAML keys with the set of story files
+and reports orphans (entries without a file), missing entries (files not in
+the YAML) and epic mismatches; --prune / --insert apply them in one save.
+
 Created: 2026-01-02
 Part of: Full Workflow Fix (Option C)
 """
 
+import os
 import re
 import sys
+import bisect
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, Iterator, List, Set, Tuple
 from datetime import datetime
 
+try:
+    import fcntl
+except ImportError:  # Windows: saves stay atomic, runs are not serialized
+    fcntl = None
+
+from story_archive import ARCHIVABLE_STATUSES, PackIndexError, StoryPack
+from story_impact import load_impacted_stories, read_changed_paths
+from story_keys import story_epic
+from story_progress import StoryProgressCache
+from story_stream import iter_sorted_story_files, iter_story_files
+import story_trace
+
+# Structured checkbox progress token kept in a story line's comment
+TASKS_TOKEN_RE = re.compile(r'\[tasks: \d+/\d+\]')
+
+# Append-only log of applied transitions: "timestamp<TAB>key<TAB>old<TAB>new" per line
+# ("-" for no status: old is "-" for an added entry, new is "-" for a removed one)
+HISTORY_LOG = Path('.sprint-status-history.tsv')
+
 
 class SprintStatusUpdater:
     """Updates sprint-status.yaml while preserving structure and comments"""
 
-    def __init__(self, sprint_status_path: str):
+    def __init__(self, sprint_status_path: str, history_log: Path = HISTORY_LOG, lock: bool = False):
+        """
+        Args:
+            lock: Hold an exclusive lock on <path>.lock until save() (for runs that write)
+        """
         self.path = Path(sprint_status_path)
+        self.history_log = Path(history_log)
+        self._lock_fd = self._acquire_lock() if lock else None
         self.content = self.path.read_text()
+        story_trace.record_read(self.path, len(self.content))
         self.lines = self.content.split('\n')
         self.updates_applied = 0
+        self.transitions: List[Tuple[str, str, str, str]] = []
+
+    def _acquire_lock(self):
+        """Block until this process holds the sprint-status lock; return its fd"""
+        if fcntl is None:
+            return None
+        fd = os.open(self.path.with_name(self.path.name + '.lock'), os.O_RDWR | os.O_CREAT, 0o644)
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        return fd
+
+    def release(self):
+        """Release the sprint-status lock (also released when the process exits)"""
+        if self._lock_fd is not None:
+            os.close(self._lock_fd)
+            self._lock_fd = None
+
+    def _record_transition(self, key: str, old_status: str, new_status: str):
+        """Remember an applied transition for the history log (written on save)"""
+        timestamp = datetime.now().strftime('%Y-%m-%dT%H:%M:%S')
+        self.transitions.append((timestamp, key, old_status or '-', new_status or '-'))
 
     def update_story_status(self, story_id: str, new_status: str, comment: str = None) -> bool:
         """
@@ -63,16 +129,19 @@ class SprintStatusUpdater:
             # Story not found - need to add it
             return self._add_story_entry(story_id, new_status, comment)
 
-        # Update existing line
-        current_line = self.lines[story_line_idx]
+        return self._rewrite_status_line(story_line_idx, story_id, new_status, comment)
+
+    def _rewrite_status_line(self, line_idx: int, key: str, new_status: str, comment: str = None) -> bool:
+        """Rewrite the status on an existing development_status line"""
+        current_line = self.lines[line_idx]
 
         # Parse current line: "  story-id: status  # comment"
-        match = re.match(r'(\s+)([a-zA-Z0-9-]+):\s*(\S+)(.*)', current_line)
+        match = re.match(r'(\s+)([a-zA-Z0-9-]+):\s*([^\s#]+)(.*)', current_line)
         if not match:
             print(f"WARNING: Could not parse line: {current_line}", file=sys.stderr)
             return False
 
-        indent, current_story_id, current_status, existing_comment = match.groups()
+        indent, current_key, current_status, existing_comment = match.groups()
 
         # Check if update needed
         if current_status == new_status:
@@ -80,17 +149,47 @@ class SprintStatusUpdater:
 
         # Build new line
         if comment:
-            new_line = f"{indent}{story_id}: {new_status}  # {comment}"
+            # Keep the structured progress token when replacing the comment
+            progress = TASKS_TOKEN_RE.search(existing_comment)
+            if progress:
+                comment = f"{comment} {progress.group(0)}"
+            new_line = f"{indent}{key}: {new_status}  # {comment}"
         elif existing_comment:
             # Preserve existing comment
-            new_line = f"{indent}{story_id}: {new_status}{existing_comment}"
+            new_line = f"{indent}{key}: {new_status}{existing_comment}"
         else:
-            new_line = f"{indent}{story_id}: {new_status}"
+            new_line = f"{indent}{key}: {new_status}"
 
-        self.lines[story_line_idx] = new_line
+        self.lines[line_idx] = new_line
         self.updates_applied += 1
+        self._record_transition(key, current_status, new_status)
         return True
 
+    def index_development_status(self) -> Dict[str, Tuple[int, str]]:
+        """
+        Index every entry in the development_status section in one pass
+
+        Returns:
+            Dict mapping key (story id or epic key) -> (line index, status)
+        """
+        index = {}
+        in_dev_status = False
+
+        for idx, line in enumerate(self.lines):
+            if line.strip() == 'development_status:':
+                in_dev_status = True
+                continue
+
+            if in_dev_status:
+                if line and not line.startswith('  ') and not line.startswith('#'):
+                    break
+
+                match = re.match(r'\s+([a-zA-Z0-9-]+):\s*([^\s#]+)', line)
+                if match and match.group(1) not in index:
+                    index[match.group(1)] = (idx, match.group(2))
+
+        return index
+
     def _add_story_entry(self, story_id: str, status: str, comment: str = None) -> bool:
         """Add a new story entry to development_status section"""
         # Find the epic this story belongs to
@@ -131,8 +230,55 @@ class SprintStatusUpdater:
         # Insert the line
         self.lines.insert(insert_idx, new_line)
         self.updates_applied += 1
+        self._record_transition(story_id, None, status)
         return True
 
+    def apply_batch(self, remove_keys: Set[str], additions: Dict[str, List[Tuple[str, str]]],
+                    comment: str = None) -> Tuple[int, int]:
+        """
+        Remove and insert development_status entries in a single pass over the lines
+
+        Both removals and additions are recorded in the history log.
+
+        Args:
+            remove_keys: Keys whose entry lines are dropped
+            additions: epic key -> [(story_id, status)] inserted after that epic's line
+
+        Returns:
+            Tuple of (entries removed, entries added)
+        """
+        new_lines = []
+        removed = added = 0
+        in_dev_status = False
+
+        for line in self.lines:
+            if not in_dev_status:
+                new_lines.append(line)
+                in_dev_status = line.strip() == 'development_status:'
+                continue
+
+            if line and not line.startswith('  ') and not line.startswith('#'):
+                in_dev_status = False
+                new_lines.append(line)
+                continue
+
+            match = re.match(r'\s+([a-zA-Z0-9-]+):\s*([^\s#]+)', line)
+            key = match.group(1) if match else None
+            if key in remove_keys:
+                self._record_transition(key, match.group(2), None)
+                removed += 1
+                continue
+
+            new_lines.append(line)
+            for story_id, status in additions.get(key, []):
+                new_lines.append(f"  {story_id}: {status}  # {comment}" if comment else f"  {story_id}: {status}")
+                self._record_transition(story_id, None, status)
+                added += 1
+
+        self.lines = new_lines
+        self.updates_applied += removed + added
+        return removed, added
+
     def update_epic_status(self, epic_key: str, new_status: str, comment: str = None) -> bool:
         """Update epic status line"""
         in_dev_status = False
@@ -157,7 +303,7 @@ class SprintStatusUpdater:
 
         # Parse current line
         current_line = self.lines[epic_line_idx]
-        match = re.match(r'(\s+)([a-zA-Z0-9-]+):\s*(\S+)(.*)', current_line)
+        match = re.match(r'(\s+)([a-zA-Z0-9-]+):\s*([^\s#]+)(.*)', current_line)
         if not match:
             return False
 
@@ -176,6 +322,33 @@ class SprintStatusUpdater:
 
         self.lines[epic_line_idx] = new_line
         self.updates_applied += 1
+        self._record_transition(epic_key, current_status, new_status)
+        return True
+
+    def set_story_progress(self, line_idx: int, checked: int, total: int) -> bool:
+        """
+        Write a story's checkbox counts into its line comment as "[tasks: checked/total]"
+
+        An existing token is replaced in place; other comment text is kept.
+
+        Returns:
+            True if the line changed
+        """
+        line = self.lines[line_idx]
+        token = f"[tasks: {checked}/{total}]"
+
+        if TASKS_TOKEN_RE.search(line):
+            new_line = TASKS_TOKEN_RE.sub(token, line)
+        elif '#' in line:
+            new_line = f"{line.rstrip()} {token}"
+        else:
+            new_line = f"{line.rstrip()}  # {token}"
+
+        if new_line == line:
+            return False
+
+        self.lines[line_idx] = new_line
+        self.updates_applied += 1
         return True
 
     def add_verification_note(self):
@@ -202,96 +375,124 @@ class SprintStatusUpdater:
             backup_dir.mkdir(exist_ok=True)
             backup_path = backup_dir / f"sprint-status-{datetime.now().strftime('%Y%m%d-%H%M%S')}.yaml"
             backup_path.write_text(self.content)
+            story_trace.record_write(backup_path, len(self.content))
             print(f"✓ Backup created: {backup_path}", file=sys.stderr)
 
-        # Write updated content
+        # Write updated content; readers see either the old or the new file
         new_content = '\n'.join(self.lines)
-        self.path.write_text(new_content)
+        tmp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(new_content)
+        os.replace(tmp_path, self.path)
+        story_trace.record_write(self.path, len(new_content))
 
-        return self.path
+        self._append_history()
+        self.release()
 
+        return self.path
 
-def scan_story_statuses(story_dir: str = "_bmad-output/implementation-artifacts/sprint-artifacts") -> Dict[str, str]:
+    def _append_history(self):
+        """Append recorded transitions to the history log in a single write"""
+        if not self.transitions:
+            return
+        data = ''.join('\t'.join(t) + '\n' for t in self.transitions).encode('utf-8')
+        fd = os.open(self.history_log, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            os.write(fd, data)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        story_trace.record_write(self.history_log, len(data))
+        self.transitions = []
+
+
+STATUS_MAPPINGS = {
+    'done': 'done',
+    'complete': 'done',
+    'completed': 'done',
+    'in-progress': 'in-progress',
+    'in_progress': 'in-progress',
+    'review': 'review',
+    'ready-for-dev': 'ready-for-dev',
+    'ready_for_dev': 'ready-for-dev',
+    'pending': 'ready-for-dev',
+    'drafted': 'ready-for-dev',
+    'backlog': 'backlog',
+    'blocked': 'blocked',
+    'deferred': 'deferred',
+    'archived': 'archived',
+}
+
+
+def normalize_status(status: str) -> str:
+    """Normalize a free-form status value to a sprint-status.yaml status"""
+    status = re.sub(r'\s*#.*$', '', status).strip().lower()
+
+    if status in STATUS_MAPPINGS:
+        return STATUS_MAPPINGS[status]
+    elif 'done' in status or 'complete' in status:
+        return 'done'
+    elif 'progress' in status:
+        return 'in-progress'
+    elif 'review' in status:
+        return 'review'
+    elif 'ready' in status:
+        return 'ready-for-dev'
+    elif 'block' in status:
+        return 'blocked'
+    elif 'defer' in status:
+        return 'deferred'
+    elif 'archive' in status:
+        return 'archived'
+    return 'ready-for-dev'
+
+
+def is_story_file(story_id: str) -> bool:
+    """Return False for special files (but NOT hardening stories like H-1)"""
+    return not (story_id.startswith('.') or
+                (story_id.startswith('EPIC-') and not story_id[5:6].isdigit()) or
+                'COMPLETION' in story_id.upper() or
+                'SUMMARY' in story_id.upper() or
+                'REPORT' in story_id.upper() or
+                'README' in story_id.upper() or
+                'INDEX' in story_id.upper() or
+                'REVIEW' in story_id.upper() or
+                'AUDIT' in story_id.upper())
+
+
+def iter_story_statuses(story_dir: str = "_bmad-output/implementation-artifacts/sprint-artifacts",
+                        only_stories: Set[str] = None, epic_num: str = None) -> Iterator[Tuple[str, str]]:
     """
-    Scan all story files and extract EXPLICIT Status: fields
+    Stream (story_id, normalized_status) for stories with EXPLICIT Status: fields
 
-    CRITICAL: Only returns stories that HAVE a Status: field.
+    Files are read one at a time in name order (see story_stream), followed by
+    archived stories from the pack index. If only_stories or epic_num is
+    given, files for other stories are not read.
+
+    CRITICAL: Only yields stories that HAVE a Status: field.
     If Status: field is missing, story is NOT included in results.
     This prevents overwriting sprint-status.yaml with defaults.
-
-    Returns:
-        Dict mapping story_id -> normalized_status (ONLY for stories with explicit Status: field)
     """
-    story_dir_path = Path(story_dir)
-    story_files = list(story_dir_path.glob("*.md"))
-
-    STATUS_MAPPINGS = {
-        'done': 'done',
-        'complete': 'done',
-        'completed': 'done',
-        'in-progress': 'in-progress',
-        'in_progress': 'in-progress',
-        'review': 'review',
-        'ready-for-dev': 'ready-for-dev',
-        'ready_for_dev': 'ready-for-dev',
-        'pending': 'ready-for-dev',
-        'drafted': 'ready-for-dev',
-        'backlog': 'backlog',
-        'blocked': 'blocked',
-        'deferred': 'deferred',
-        'archived': 'archived',
-    }
-
-    story_statuses = {}
+    found_count = 0
     skipped_count = 0
 
-    for story_file in story_files:
-        story_id = story_file.stem
+    def in_scope(story_id):
+        return (is_story_file(story_id) and
+                (epic_num is None or story_id.startswith(f"{epic_num}-")) and
+                (only_stories is None or story_id in only_stories))
 
-        # Skip special files (but NOT hardening stories like H-1)
-        if (story_id.startswith('.') or
-            (story_id.startswith('EPIC-') and not story_id[5:6].isdigit()) or
-            'COMPLETION' in story_id.upper() or
-            'SUMMARY' in story_id.upper() or
-            'REPORT' in story_id.upper() or
-            'README' in story_id.upper() or
-            'INDEX' in story_id.upper() or
-            'REVIEW' in story_id.upper() or
-            'AUDIT' in story_id.upper()):
-            continue
+    for story_file in iter_sorted_story_files(story_dir, lambda name: in_scope(name[:-3])):
+        story_id = story_file.stem
 
         try:
             content = story_file.read_text()
+            story_trace.record_read(story_file, len(content))
 
             # Extract Status field
             status_match = re.search(r'^Status:\s*(.+?)$', content, re.MULTILINE | re.IGNORECASE)
 
             if status_match:
-                status = status_match.group(1).strip()
-                # Remove comments
-                status = re.sub(r'\s*#.*$', '', status).strip().lower()
-
-                # Normalize status
-                if status in STATUS_MAPPINGS:
-                    normalized_status = STATUS_MAPPINGS[status]
-                elif 'done' in status or 'complete' in status:
-                    normalized_status = 'done'
-                elif 'progress' in status:
-                    normalized_status = 'in-progress'
-                elif 'review' in status:
-                    normalized_status = 'review'
-                elif 'ready' in status:
-                    normalized_status = 'ready-for-dev'
-                elif 'block' in status:
-                    normalized_status = 'blocked'
-                elif 'defer' in status:
-                    normalized_status = 'deferred'
-                elif 'archive' in status:
-                    normalized_status = 'archived'
-                else:
-                    normalized_status = 'ready-for-dev'
-
-                story_statuses[story_id] = normalized_status
+                found_count += 1
+                yield story_id, normalize_status(status_match.group(1))
             else:
                 # CRITICAL FIX: No Status: field found
                 # Do NOT default to ready-for-dev - skip this story entirely
@@ -302,10 +503,691 @@ def scan_story_statuses(story_dir: str = "_bmad-output/implementation-artifacts/
             print(f"ERROR parsing {story_id}: {e}", file=sys.stderr)
             continue
 
-    print(f"✓ Found {len(story_statuses)} stories with explicit Status: fields", file=sys.stderr)
+    # Archived stories: status comes from the pack index, bodies stay compressed
+    packed_count = 0
+    for story_id, status in sorted(StoryPack(story_dir).statuses()):
+        if not in_scope(story_id) or (Path(story_dir) / f"{story_id}.md").exists():
+            continue
+        packed_count += 1
+        yield story_id, status
+
+    print(f"✓ Found {found_count + packed_count} stories with explicit Status: fields", file=sys.stderr)
+    if packed_count:
+        print(f"ℹ Included {packed_count} archived stories from the pack index", file=sys.stderr)
     print(f"ℹ Skipped {skipped_count} stories without Status: fields (trust sprint-status.yaml)", file=sys.stderr)
 
-    return story_statuses
+
+def scan_story_statuses(story_dir: str = "_bmad-output/implementation-artifacts/sprint-artifacts",
+                        only_stories: Set[str] = None) -> Dict[str, str]:
+    """
+    Scan all story files and extract EXPLICIT Status: fields
+
+    Returns:
+        Dict mapping story_id -> normalized_status (ONLY for stories with explicit Status: field)
+    """
+    return dict(iter_story_statuses(story_dir, only_stories))
+
+
+# Matches "Status: x", the "**Status:** x" form written by add-status-fields.py, and a
+# "## Status" heading whose value is on the next non-blank line. Group 2 is the value.
+STATUS_LINE_RE = re.compile(
+    r'^(\*{0,2}Status:\*{0,2}[ \t]*|#{2,}[ \t]*Status[ \t]*\n(?:[ \t]*\n)*(?!#))(.*?)[ \t]*$',
+    re.MULTILINE | re.IGNORECASE,
+)
+
+
+def stamp_story_status(content: str, status: str) -> str:
+    """Insert a **Status:** field after the title, before the first ## section"""
+    lines = content.split('\n')
+
+    insert_idx = None
+    for idx, line in enumerate(lines):
+        if line.startswith('# ') and idx == 0:
+            continue
+        if line.startswith('##'):
+            insert_idx = idx
+            break
+
+    if insert_idx is None:
+        insert_idx = 1
+
+    # Keep exactly one blank line on each side of the new field
+    stamp = [f'**Status:** {status}', '']
+    if lines[insert_idx - 1].strip():
+        stamp.insert(0, '')
+    lines[insert_idx:insert_idx] = stamp
+    return '\n'.join(lines)
+
+
+def sync_statuses(updater: SprintStatusUpdater, story_dir: str, conflict: str = 'story',
+                  epic_num: str = None, dry_run: bool = False,
+                  only_stories: Set[str] = None) -> Dict[str, List[Tuple[str, str, str]]]:
+    """
+    Two-way sync between story files and sprint-status.yaml in a single pass
+
+    Both sides are loaded once: the YAML is indexed by key and the story
+    directory is walked once, joining each file to its YAML entry by story id.
+
+      - File has no Status: field -> stamp it with the YAML status
+      - File has a status the YAML lacks -> add the story to the YAML
+      - Both have a status and they differ -> resolve with `conflict`:
+          'story' updates the YAML, 'yaml' rewrites the file, 'skip' reports only
+
+    Archived stories are joined using the status in the pack index; they
+    are read-only, so a 'yaml' conflict on one is reported, not rewritten.
+
+    Returns:
+        Dict of action -> list of (story_id, old, new)
+    """
+    yaml_index = updater.index_development_status()
+    report = {'stamp': [], 'update': [], 'add': [], 'restamp': [], 'conflict': [], 'untracked': []}
+    pending_adds = []
+    comment = f"Updated {datetime.now().strftime('%Y-%m-%d')}"
+
+    # Same story-key match as reconcile: is_story_file() would skip real
+    # stories whose slug says e.g. "audit" or "summary"
+    def in_scope(story_id):
+        return (bool(STORY_KEY_RE.match(story_id)) and
+                not (epic_num and not story_id.startswith(f"{epic_num}-")) and
+                not (only_stories is not None and story_id not in only_stories))
+
+    for story_file in iter_sorted_story_files(story_dir, lambda name: in_scope(name[:-3])):
+        story_id = story_file.stem
+
+        try:
+            content = story_file.read_text()
+        except Exception as e:
+            print(f"ERROR reading {story_id}: {e}", file=sys.stderr)
+            continue
+        story_trace.record_read(story_file, len(content))
+
+        entry = yaml_index.get(story_id)
+        status_match = STATUS_LINE_RE.search(content)
+
+        if status_match is None:
+            if entry is None:
+                report['untracked'].append((story_id, None, None))
+                continue
+            report['stamp'].append((story_id, None, entry[1]))
+            if not dry_run:
+                stamped = stamp_story_status(content, entry[1])
+                story_file.write_text(stamped)
+                story_trace.record_write(story_file, len(stamped))
+            continue
+
+        file_status = normalize_status(status_match.group(2))
+
+        if entry is None:
+            pending_adds.append((story_id, file_status))
+            continue
+
+        line_idx, yaml_status = entry
+        if normalize_status(yaml_status) == file_status:
+            continue
+
+        if conflict == 'story':
+            report['update'].append((story_id, yaml_status, file_status))
+            updater._rewrite_status_line(line_idx, story_id, file_status, comment)
+        elif conflict == 'yaml':
+            report['restamp'].append((story_id, status_match.group(2), yaml_status))
+            if not dry_run:
+                restamped = content[:status_match.start(2)] + yaml_status + content[status_match.end(2):]
+                story_file.write_text(restamped)
+                story_trace.record_write(story_file, len(restamped))
+        else:
+            report['conflict'].append((story_id, yaml_status, file_status))
+
+    for story_id, packed_status in sorted(StoryPack(story_dir).statuses()):
+        if not in_scope(story_id) or (Path(story_dir) / f"{story_id}.md").exists():
+            continue
+
+        entry = yaml_index.get(story_id)
+        if entry is None:
+            pending_adds.append((story_id, packed_status))
+            continue
+
+        line_idx, yaml_status = entry
+        if normalize_status(yaml_status) == packed_status:
+            continue
+
+        if conflict == 'story':
+            report['update'].append((story_id, yaml_status, packed_status))
+            updater._rewrite_status_line(line_idx, story_id, packed_status, comment)
+        else:
+            report['conflict'].append((story_id, yaml_status, packed_status))
+
+    # Insert new entries last, in one pass: inserting shifts the indexed line numbers
+    additions: Dict[str, List[Tuple[str, str]]] = {}
+    for story_id, file_status in pending_adds:
+        epic_key = f"epic-{story_epic(story_id)}"
+        if epic_key in yaml_index:
+            additions.setdefault(epic_key, []).append((story_id, file_status))
+            report['add'].append((story_id, None, file_status))
+        else:
+            report['untracked'].append((story_id, None, file_status))
+    updater.apply_batch(set(), additions, comment)
+
+    return report
+
+
+def impacted_stories(args) -> Set[str]:
+    """Resolve --changed/--changed-from to impacted story ids (None = all stories)"""
+    if not (args.changed or args.changed_from):
+        return None
+    return load_impacted_stories(args.story_dir, read_changed_paths(args.changed, args.changed_from))
+
+
+def iter_history(path: Path = HISTORY_LOG):
+    """Stream (timestamp, key, old_status, new_status) records from the history log (None for "-")"""
+    if not path.exists():
+        return
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            fields = line.rstrip('\n').split('\t')
+            if len(fields) != 4:
+                continue  # Tolerate a torn final line
+            timestamp, key, old_status, new_status = fields
+            yield (timestamp, key, None if old_status == '-' else old_status,
+                   None if new_status == '-' else new_status)
+
+
+def history_report(yaml_index: Dict[str, Tuple[int, str]], epic_num: str = None,
+                   path: Path = HISTORY_LOG) -> Dict[str, dict]:
+    """
+    Compute burndown and cycle time per epic by streaming the log
+
+    The log is streamed twice: once to find each story's status before its
+    first logged transition, then to replay the transitions. Burndown counts
+    stories not yet done at the end of each day that saw a transition; the
+    epic's story total comes from the current YAML plus any story seen in the
+    log, minus stories whose entry was later removed. Cycle time runs from a story's first move to in-progress until its
+    next move to done.
+
+    Returns:
+        Dict of epic number -> {'total', 'burndown': [(day, remaining)],
+                                'cycle_days': [float], 'done_at': {story_id: timestamp}}
+    """
+    epics: Dict[str, dict] = {}
+
+    def epic_entry(epic):
+        if epic not in epics:
+            epics[epic] = {'stories': set(), 'done': set(), 'daily_done': {},
+                           'started': {}, 'cycle_days': [], 'done_at': {}}
+        return epics[epic]
+
+    def in_scope(key):
+        epic = story_epic(key)
+        return epic if epic and (epic_num is None or epic == epic_num) else None
+
+    # Pass 1: each logged story's status before its first logged transition
+    first_status = {}
+    for _, key, old_status, _ in iter_history(path):
+        if in_scope(key) and key not in first_status:
+            first_status[key] = old_status
+
+    # Stories never logged have held their current YAML status throughout
+    for key, (_, status) in yaml_index.items():
+        epic = in_scope(key)
+        if epic:
+            entry = epic_entry(epic)
+            entry['stories'].add(key)
+            if key not in first_status and status == 'done':
+                entry['done'].add(key)
+    for key, old_status in first_status.items():
+        entry = epic_entry(in_scope(key))
+        entry['stories'].add(key)
+        if old_status == 'done':
+            entry['done'].add(key)
+
+    # Pass 2: replay transitions
+    for timestamp, key, old_status, new_status in iter_history(path):
+        epic = in_scope(key)
+        if epic is None:
+            continue
+
+        entry = epics[epic]
+        day = timestamp[:10]
+
+        if new_status is None:
+            # Entry removed (e.g. reconcile --prune): drop it from the epic entirely
+            entry['stories'].discard(key)
+            entry['done'].discard(key)
+            entry['done_at'].pop(key, None)
+            entry['started'].pop(key, None)
+            entry['daily_done'][day] = len(entry['done'])
+            continue
+
+        if new_status == 'in-progress' and key not in entry['started']:
+            entry['started'][key] = timestamp
+
+        if new_status == 'done' and key not in entry['done']:
+            entry['done'].add(key)
+            entry['done_at'][key] = timestamp
+            started = entry['started'].pop(key, None)
+            if started:
+                elapsed = datetime.fromisoformat(timestamp) - datetime.fromisoformat(started)
+                entry['cycle_days'].append(elapsed.total_seconds() / 86400)
+        elif new_status != 'done' and key in entry['done']:
+            entry['done'].discard(key)
+            entry['done_at'].pop(key, None)
+
+        entry['daily_done'][day] = len(entry['done'])
+
+    report = {}
+    for epic, entry in epics.items():
+        total = len(entry['stories'])
+        report[epic] = {
+            'total': total,
+            'burndown': [(day, total - done) for day, done in sorted(entry['daily_done'].items())],
+            'cycle_days': entry['cycle_days'],
+            'done_at': entry['done_at'],
+        }
+    return report
+
+
+def writes(args) -> bool:
+    """
+    Return True if this run will save, i.e. must hold the sprint-status lock
+
+    --dry-run and --validate never save in any mode; reconcile only saves
+    with --prune or --insert, and history never does.
+    """
+    if args.dry_run or args.validate or args.mode in ('validate', 'history'):
+        return False
+    if args.mode == 'reconcile':
+        return args.prune or args.insert
+    return True
+
+
+def run_history(args) -> int:
+    """Run --mode history and print burndown and cycle time per epic"""
+    epic_num = None
+    if args.epic:
+        epic_match = re.match(r'epic-([0-9a-z-]+)', args.epic)
+        if not epic_match:
+            print(f"WARNING: Invalid epic format: {args.epic}", file=sys.stderr)
+        else:
+            epic_num = epic_match.group(1)
+
+    history_path = Path(args.history_log)
+    if not history_path.exists():
+        print(f"ℹ No status history yet ({history_path})", file=sys.stderr)
+        return 0
+
+    updater = SprintStatusUpdater(args.sprint_status, args.history_log)
+    report = history_report(updater.index_development_status(), epic_num, history_path)
+
+    def epic_sort_key(epic):
+        return (int(re.match(r'\d+', epic).group()), epic)
+
+    for epic in sorted(report, key=epic_sort_key):
+        entry = report[epic]
+        if not entry['burndown']:
+            continue
+        print(f"epic-{epic}: {entry['total']} stories")
+        print("  Burndown (stories not done at end of day):")
+        for day, remaining in entry['burndown']:
+            print(f"    {day}  {remaining}")
+
+        cycle_days = sorted(entry['cycle_days'])
+        if cycle_days:
+            median = cycle_days[len(cycle_days) // 2] if len(cycle_days) % 2 else \
+                (cycle_days[len(cycle_days) // 2 - 1] + cycle_days[len(cycle_days) // 2]) / 2
+            print(f"  Cycle time (in-progress → done): n={len(cycle_days)}, "
+                  f"median {median:.1f}d, max {cycle_days[-1]:.1f}d")
+        for story_id, timestamp in sorted(entry['done_at'].items(), key=lambda kv: kv[1]):
+            print(f"  ✓ {timestamp}  {story_id}")
+        print("")
+
+    return 0
+
+
+def archive_finished_stories(updater: SprintStatusUpdater, story_dir: str, epic_num: str = None,
+                             dry_run: bool = False) -> Dict[str, Tuple[Path, str]]:
+    """
+    Move finished stories into the compressed story pack
+
+    A story is archived when its sprint-status.yaml status is done/archived
+    and its own Status: field (if any) agrees.
+
+    Returns:
+        Dict of story_id -> (story file, status) for the archived stories
+    """
+    yaml_index = updater.index_development_status()
+    candidates = {}
+
+    # Same story-key match as sync and reconcile (is_story_file() would skip
+    # e.g. "6-7-centralized-audit-log-viewer-admin")
+    def in_scope(name):
+        story_id = name[:-3]
+        return bool(STORY_KEY_RE.match(story_id)) and not (epic_num and not story_id.startswith(f"{epic_num}-"))
+
+    for story_file in iter_sorted_story_files(story_dir, in_scope):
+        story_id = story_file.stem
+
+        entry = yaml_index.get(story_id)
+        if entry is None or normalize_status(entry[1]) not in ARCHIVABLE_STATUSES:
+            continue
+
+        content = story_file.read_text()
+        story_trace.record_read(story_file, len(content))
+        status_match = STATUS_LINE_RE.search(content)
+        if status_match and normalize_status(status_match.group(2)) not in ARCHIVABLE_STATUSES:
+            continue  # Story file disagrees - leave it in the working set
+
+        candidates[story_id] = (story_file, normalize_status(entry[1]))
+
+    if not dry_run:
+        StoryPack(story_dir).add(candidates)
+    return candidates
+
+
+def run_archive(args) -> int:
+    """Run --mode archive"""
+    epic_num = None
+    if args.epic:
+        epic_match = re.match(r'epic-([0-9a-z-]+)', args.epic)
+        if not epic_match:
+            print(f"WARNING: Invalid epic format: {args.epic}", file=sys.stderr)
+        else:
+            epic_num = epic_match.group(1)
+
+    updater = SprintStatusUpdater(args.sprint_status, args.history_log, lock=writes(args))
+    archived = archive_finished_stories(updater, args.story_dir, epic_num, not writes(args))
+
+    for story_id in sorted(archived)[:20]:
+        print(f"  [ARCHIVE] {story_id}", file=sys.stderr)
+    if len(archived) > 20:
+        print(f"  ... and {len(archived) - 20} more", file=sys.stderr)
+
+    if args.validate:
+        if archived:
+            print(f"✗ Validation failed - {len(archived)} finished stories not archived", file=sys.stderr)
+            return 1
+        print("✓ No finished stories left to archive", file=sys.stderr)
+    elif args.dry_run:
+        print(f"DRY RUN: Would archive {len(archived)} finished stories", file=sys.stderr)
+    else:
+        pack = StoryPack(args.story_dir)
+        print(f"✓ Archived {len(archived)} finished stories ({len(pack)} in {pack.pack_path})", file=sys.stderr)
+    return 0
+
+
+def run_progress(args) -> int:
+    """Run --mode progress: refresh cached checkbox counts and write them in one save"""
+    epic_num = None
+    if args.epic:
+        epic_match = re.match(r'epic-([0-9a-z-]+)', args.epic)
+        if not epic_match:
+            print(f"WARNING: Invalid epic format: {args.epic}", file=sys.stderr)
+        else:
+            epic_num = epic_match.group(1)
+
+    # Lock first: the cache and sprint-status.yaml are saved under the same lock
+    updater = SprintStatusUpdater(args.sprint_status, args.history_log, lock=writes(args))
+
+    cache = StoryProgressCache(args.story_dir)
+    recounted = cache.refresh()
+    if writes(args):
+        cache.save()
+    print(f"✓ Progress cache: {len(cache.stories)} stories ({recounted} recounted)", file=sys.stderr)
+
+    yaml_index = updater.index_development_status()
+    tracked = set()
+
+    for key, (line_idx, _) in yaml_index.items():
+        if key.startswith('epic-') or (epic_num and story_epic(key) != epic_num):
+            continue
+        counts = cache.counts(key)
+        if counts is None:
+            continue
+        tracked.add(key)
+        updater.set_story_progress(line_idx, *counts)
+
+    print("", file=sys.stderr)
+    summary = cache.epic_summary(tracked)
+    for epic in sorted(summary, key=lambda e: (int(re.match(r'\d+', e).group()), e)):
+        stories, checked, total = summary[epic]
+        percent = (checked / total * 100) if total else 0.0
+        print(f"  epic-{epic}: {checked}/{total} tasks ({percent:.0f}%) across {stories} stories",
+              file=sys.stderr)
+    print("", file=sys.stderr)
+
+    if args.validate and updater.updates_applied > 0:
+        print(f"✗ Validation failed - progress out of date on {updater.updates_applied} stories",
+              file=sys.stderr)
+        return 1
+    if args.dry_run or args.validate:
+        print(f"DRY RUN: Would update progress on {updater.updates_applied} stories", file=sys.stderr)
+        return 0
+
+    if updater.updates_applied > 0:
+        updater.save(backup=True)
+    print(f"✓ Updated progress on {updater.updates_applied} stories", file=sys.stderr)
+    return 0
+
+
+def run_sync(args) -> int:
+    """Run --mode sync and print its report"""
+    epic_num = None
+    if args.epic:
+        epic_match = re.match(r'epic-([0-9a-z-]+)', args.epic)
+        if not epic_match:
+            print(f"WARNING: Invalid epic format: {args.epic}", file=sys.stderr)
+        else:
+            epic_num = epic_match.group(1)
+
+    updater = SprintStatusUpdater(args.sprint_status, args.history_log, lock=writes(args))
+    report = sync_statuses(updater, args.story_dir, args.conflict, epic_num, not writes(args),
+                           impacted_stories(args))
+
+    labels = {
+        'stamp': 'STAMP', 'update': 'UPDATE', 'add': 'ADD',
+        'restamp': 'RESTAMP', 'conflict': 'CONFLICT', 'untracked': 'UNTRACKED',
+    }
+    for action, label in labels.items():
+        for story_id, old_status, new_status in report[action][:20]:
+            if action == 'untracked' and new_status is None:
+                print(f"  [{label}] {story_id}: no Status: field and not in sprint-status.yaml", file=sys.stderr)
+            elif action == 'untracked':
+                print(f"  [{label}] {story_id}: {new_status} (no epic entry to add it under)", file=sys.stderr)
+            else:
+                print(f"  [{label}] {story_id}: {old_status or '(none)'} → {new_status}", file=sys.stderr)
+        if len(report[action]) > 20:
+            print(f"  ... and {len(report[action]) - 20} more [{label}]", file=sys.stderr)
+
+    print("", file=sys.stderr)
+    print(f"✓ Stamped {len(report['stamp'])} story files, rewrote {len(report['restamp'])}", file=sys.stderr)
+    print(f"✓ {len(report['update'])} YAML updates, {len(report['add'])} YAML additions", file=sys.stderr)
+    if report['conflict']:
+        print(f"⚠ {len(report['conflict'])} conflicts left unresolved (--conflict skip)", file=sys.stderr)
+
+    if args.validate:
+        if any(report[action] for action in ('stamp', 'update', 'add', 'restamp', 'conflict')):
+            print("✗ Validation failed - story files and sprint-status.yaml disagree", file=sys.stderr)
+            return 1
+        return 0
+    if args.dry_run:
+        print("DRY RUN: No files were modified", file=sys.stderr)
+        return 0
+
+    if updater.updates_applied > 0:
+        updater.add_verification_note()
+        updater.save(backup=True)
+        print(f"✓ Updated: {updater.path}", file=sys.stderr)
+
+    return 0
+
+
+# Story ids: "7-2-foo", "8a-1-bar", "H-1-baz" (not epic notes or review/audit files)
+STORY_KEY_RE = re.compile(r'^(?:\d+[a-z]?|[A-Z])-\d+[a-z]?(?:-|$)')
+EPIC_KEY_RE = re.compile(r'^epic-(\d+[a-z]?)$')
+# Section header comment in development_status, e.g. "  # Epic 6: Audit & Compliance"
+EPIC_HEADER_RE = re.compile(r'^\s*#\s*Epic\s+(\d+[a-z]?)\b(?!-)', re.IGNORECASE)
+YAML_KEY_RE = re.compile(r'^[a-zA-Z0-9-]+$')  # Keys index_development_status() can parse
+
+
+def yaml_epic_headers(updater: SprintStatusUpdater) -> Iterator[Tuple[int, str]]:
+    """Yield (line index, epic number) for "# Epic N" header comments in development_status"""
+    in_dev_status = False
+    for idx, line in enumerate(updater.lines):
+        if line.strip() == 'development_status:':
+            in_dev_status = True
+            continue
+        if in_dev_status:
+            if line and not line.startswith('  ') and not line.startswith('#'):
+                break
+            header_match = EPIC_HEADER_RE.match(line)
+            if header_match:
+                yield idx, header_match.group(1)
+
+
+def reconcile(updater: SprintStatusUpdater, story_dir: str, epic_num: str = None) -> Dict[str, list]:
+    """
+    Reconcile development_status keys against the story directory with set differences
+
+    The YAML is indexed in one pass and the directory listed in one pass
+    (archived stories count as present via the pack index); everything
+    else is set arithmetic, so the cost is linear in entries plus files.
+    Only missing stories' files are opened, to read the status to insert.
+
+    Returns:
+        Dict with:
+          'orphans':     [(story_id, yaml_status)] YAML entries with no story file
+          'missing':     [(story_id, status)] story files with no YAML entry
+          'no_epic':     [(story_id, epic)] stories whose epic-N entry does not exist
+          'misplaced':   [(story_id, section_epic)] entries listed in another epic's section
+          'empty_epics': [epic] epic-N entries with no stories at all
+    """
+    def in_scope(story_id):
+        return epic_num is None or story_epic(story_id) == epic_num
+
+    # Pass 1: YAML keys
+    yaml_index = updater.index_development_status()
+    yaml_epics = {}
+    for key, (line_idx, _) in yaml_index.items():
+        epic_match = EPIC_KEY_RE.match(key)
+        if epic_match:
+            yaml_epics[epic_match.group(1)] = line_idx
+    yaml_stories = {key for key in yaml_index
+                    if not key.startswith('epic-') and STORY_KEY_RE.match(key) and in_scope(key)}
+
+    # Pass 2: directory listing (plus the pack index for archived stories). The
+    # same key pattern as the YAML side decides what is a story: is_story_file()
+    # would drop real stories whose slug says e.g. "audit" or "summary".
+    def is_story_name(name):
+        story_id = name[:-3]
+        return bool(STORY_KEY_RE.match(story_id)) and in_scope(story_id)
+
+    file_stories = {path.stem for path in iter_story_files(story_dir, is_story_name)}
+    pack = StoryPack(story_dir)
+    packed = {story_id for story_id in pack.index if in_scope(story_id)} - file_stories
+    present = file_stories | packed
+
+    missing = []
+    for story_id in sorted(present - yaml_stories):
+        if story_id in packed:
+            status = pack.index[story_id]['status']
+        else:
+            story_file = Path(story_dir) / f"{story_id}.md"
+            content = story_file.read_text()
+            story_trace.record_read(story_file, len(content))
+            status_match = STATUS_LINE_RE.search(content)
+            status = normalize_status(status_match.group(2) if status_match else 'drafted')
+        missing.append((story_id, status))
+
+    all_stories = yaml_stories | present
+    story_epics = {story_id: story_epic(story_id) for story_id in all_stories}
+
+    # Section of each YAML entry = nearest "# Epic N" header comment or epic-N
+    # line above it; files put the epic-N line before or after its stories,
+    # but a header comment, when present, always opens the section.
+    anchors = sorted(list(yaml_epic_headers(updater)) +
+                     [(line_idx, epic) for epic, line_idx in yaml_epics.items()])
+    anchor_lines = [line_idx for line_idx, _ in anchors]
+    misplaced = []
+    for story_id in sorted(yaml_stories):
+        epic = story_epics[story_id]
+        pos = bisect.bisect_right(anchor_lines, yaml_index[story_id][0]) - 1
+        section = anchors[pos][1] if pos >= 0 else None
+        if epic and epic in yaml_epics and section != epic:
+            misplaced.append((story_id, section))
+
+    used_epics = set(story_epics.values())
+    return {
+        'orphans': [(story_id, yaml_index[story_id][1]) for story_id in sorted(yaml_stories - present)],
+        'missing': missing,
+        'no_epic': sorted((story_id, epic) for story_id, epic in story_epics.items()
+                          if epic and epic not in yaml_epics),
+        'misplaced': misplaced,
+        'empty_epics': sorted(epic for epic in yaml_epics
+                              if epic not in used_epics and (epic_num is None or epic == epic_num)),
+    }
+
+
+def run_reconcile(args) -> int:
+    """Run --mode reconcile, optionally pruning orphans / inserting missing entries in one save"""
+    epic_num = None
+    if args.epic:
+        epic_match = re.match(r'epic-([0-9a-z-]+)', args.epic)
+        if not epic_match:
+            print(f"WARNING: Invalid epic format: {args.epic}", file=sys.stderr)
+        else:
+            epic_num = epic_match.group(1)
+
+    updater = SprintStatusUpdater(args.sprint_status, args.history_log, lock=writes(args))
+    report = reconcile(updater, args.story_dir, epic_num)
+
+    for story_id, status in report['orphans'][:20]:
+        print(f"  [ORPHAN] {story_id}: {status} (no story file)", file=sys.stderr)
+    for story_id, status in report['missing'][:20]:
+        print(f"  [MISSING] {story_id}: {status} (not in sprint-status.yaml)", file=sys.stderr)
+    for story_id, epic in report['no_epic'][:20]:
+        print(f"  [NO-EPIC] {story_id}: no epic-{epic} entry", file=sys.stderr)
+    for story_id, section in report['misplaced'][:20]:
+        print(f"  [MISPLACED] {story_id}: listed under {f'epic-{section}' if section else 'no epic'}",
+              file=sys.stderr)
+    for epic in report['empty_epics'][:20]:
+        print(f"  [EMPTY-EPIC] epic-{epic}: no stories", file=sys.stderr)
+
+    print("", file=sys.stderr)
+    print(f"✓ {len(report['orphans'])} orphans, {len(report['missing'])} missing entries", file=sys.stderr)
+    print(f"✓ {len(report['no_epic'])} stories without an epic entry, {len(report['misplaced'])} misplaced, "
+          f"{len(report['empty_epics'])} empty epics", file=sys.stderr)
+
+    drift = any(report.values())
+    if args.validate and drift:
+        print("✗ Validation failed - sprint-status.yaml has drifted from the story files", file=sys.stderr)
+        return 1
+    if not (args.prune or args.insert):
+        return 0
+
+    remove_keys = {story_id for story_id, _ in report['orphans']} if args.prune else set()
+    additions: Dict[str, List[Tuple[str, str]]] = {}
+    skipped = 0
+    if args.insert:
+        no_epic = {story_id for story_id, _ in report['no_epic']}
+        for story_id, status in report['missing']:
+            epic = story_epic(story_id)
+            if epic is None or story_id in no_epic or not YAML_KEY_RE.match(story_id):
+                skipped += 1  # No epic-N entry to insert it under, or not a valid YAML key
+                continue
+            additions.setdefault(f"epic-{epic}", []).append((story_id, status))
+
+    if args.dry_run:
+        print(f"DRY RUN: Would prune {len(remove_keys)} and insert "
+              f"{sum(len(v) for v in additions.values())} entries", file=sys.stderr)
+        return 0
+
+    removed, added = updater.apply_batch(remove_keys, additions, f"Reconciled {datetime.now().strftime('%Y-%m-%d')}")
+    if skipped:
+        print(f"⚠ {skipped} missing stories not inserted (no epic entry to add them under, "
+              f"or the id is not a valid sprint-status key)", file=sys.stderr)
+    if updater.updates_applied > 0:
+        updater.add_verification_note()
+        updater.save(backup=True)
+    print(f"✓ Pruned {removed} orphans, inserted {added} missing entries", file=sys.stderr)
+    return 0
 
 
 def main():
@@ -320,73 +1202,104 @@ def main():
     parser.add_argument('--story-dir', default='_bmad-output/implementation-artifacts/sprint-artifacts',
                         help='Path to story files directory')
     parser.add_argument('--epic', type=str, help='Validate specific epic only (e.g., epic-1)')
-    parser.add_argument('--mode', choices=['validate', 'fix'], default='validate',
-                        help='Mode: validate (report only) or fix (apply updates)')
+    parser.add_argument('--mode', choices=['validate', 'fix', 'sync', 'history', 'archive', 'progress',
+                                           'reconcile'],
+                        default='validate',
+                        help='Mode: validate (report only), fix (apply updates), sync (two-way), '
+                             'history (burndown and cycle time from the status log), '
+                             'archive (pack finished stories), progress (checkbox counts) or '
+                             'reconcile (orphans, missing entries and epic mismatches)')
+    parser.add_argument('--history-log', default=str(HISTORY_LOG),
+                        help='Path to the status history log')
+    parser.add_argument('--conflict', choices=['story', 'yaml', 'skip'], default='story',
+                        help='Sync mode: which side wins when both have a different status')
+    parser.add_argument('--changed', nargs='+', metavar='PATH',
+                        help='Process only stories that reference these changed repo paths')
+    parser.add_argument('--changed-from', metavar='FILE',
+                        help="Read changed repo paths from FILE, one per line ('-' for stdin)")
+    parser.add_argument('--prune', action='store_true',
+                        help='Reconcile mode: remove YAML entries that have no story file')
+    parser.add_argument('--insert', action='store_true',
+                        help='Reconcile mode: add story files missing from the YAML under their epic')
     args = parser.parse_args()
-
-    # Scan story files
-    print("Scanning story files...", file=sys.stderr)
-    story_statuses = scan_story_statuses(args.story_dir)
-
-    # Filter by epic if specified
+    story_trace.start('sprint-status-updater', epic=args.epic)
+
+    if args.mode == 'sync':
+        sys.exit(run_sync(args))
+    if args.mode == 'history':
+        sys.exit(run_history(args))
+    if args.mode == 'archive':
+        sys.exit(run_archive(args))
+    if args.mode == 'progress':
+        sys.exit(run_progress(args))
+    if args.mode == 'reconcile':
+        sys.exit(run_reconcile(args))
+
+    epic_num = None
     if args.epic:
         # Extract epic number from epic key (e.g., "epic-1" -> "1")
         epic_match = re.match(r'epic-([0-9a-z-]+)', args.epic)
         if epic_match:
             epic_num = epic_match.group(1)
-            # Filter stories that start with this epic number
-            story_statuses = {k: v for k, v in story_statuses.items()
-                            if k.startswith(f"{epic_num}-")}
-            print(f"✓ Filtered to {len(story_statuses)} stories for {args.epic}", file=sys.stderr)
         else:
             print(f"WARNING: Invalid epic format: {args.epic}", file=sys.stderr)
 
-    print(f"✓ Scanned {len(story_statuses)} story files", file=sys.stderr)
-    print("", file=sys.stderr)
-
-    # Load sprint-status.yaml
-    updater = SprintStatusUpdater(args.sprint_status)
+    # Load sprint-status.yaml and index it once
+    updater = SprintStatusUpdater(args.sprint_status, args.history_log, lock=writes(args))
+    yaml_index = updater.index_development_status()
 
-    # Find discrepancies
-    discrepancies = []
-
-    for story_id, new_status in story_statuses.items():
-        # Check current status in sprint-status.yaml
-        current_status = None
-        in_dev_status = False
+    # Stream story files and diff each against the index as it arrives.
+    # Updates are applied to the in-memory lines right away; they are only
+    # saved in fix mode. Only the first 20 discrepancies are kept for display.
+    print("Scanning story files...", file=sys.stderr)
+    comment = f"Updated {datetime.now().strftime('%Y-%m-%d')}"
+    shown = []
+    pending_adds = []
+    scanned_count = 0
+    discrepancy_count = 0
+
+    for story_id, new_status in iter_story_statuses(args.story_dir, impacted_stories(args), epic_num):
+        scanned_count += 1
+        entry = yaml_index.get(story_id)
+
+        if entry is None:
+            discrepancy = (story_id, 'NOT-IN-FILE', new_status)
+            pending_adds.append((story_id, new_status))
+        elif entry[1] != new_status:
+            discrepancy = (story_id, entry[1], new_status)
+            updater._rewrite_status_line(entry[0], story_id, new_status, comment)
+        else:
+            continue
 
-        for line in updater.lines:
-            if line.strip() == 'development_status:':
-                in_dev_status = True
-                continue
+        discrepancy_count += 1
+        if len(shown) < 20:
+            shown.append(discrepancy)
 
-            if in_dev_status and story_id in line:
-                match = re.match(r'\s+[a-zA-Z0-9-]+:\s*(\S+)', line)
-                if match:
-                    current_status = match.group(1)
-                    break
+    # Insert new entries last: inserting shifts the indexed line numbers
+    for story_id, new_status in pending_adds:
+        updater._add_story_entry(story_id, new_status, comment)
 
-        if current_status is None:
-            discrepancies.append((story_id, 'NOT-IN-FILE', new_status))
-        elif current_status != new_status:
-            discrepancies.append((story_id, current_status, new_status))
+    if epic_num:
+        print(f"✓ Filtered to {args.epic}", file=sys.stderr)
+    print(f"✓ Scanned {scanned_count} story files", file=sys.stderr)
+    print("", file=sys.stderr)
 
     # Report
-    if not discrepancies:
+    if not discrepancy_count:
         print("✓ sprint-status.yaml is up to date!", file=sys.stderr)
         sys.exit(0)
 
-    print(f"⚠ Found {len(discrepancies)} discrepancies:", file=sys.stderr)
+    print(f"⚠ Found {discrepancy_count} discrepancies:", file=sys.stderr)
     print("", file=sys.stderr)
 
-    for story_id, old_status, new_status in discrepancies[:20]:
+    for story_id, old_status, new_status in shown:
         if old_status == 'NOT-IN-FILE':
             print(f"  [ADD] {story_id}: (not in file) → {new_status}", file=sys.stderr)
         else:
             print(f"  [UPDATE] {story_id}: {old_status} → {new_status}", file=sys.stderr)
 
-    if len(discrepancies) > 20:
-        print(f"  ... and {len(discrepancies) - 20} more", file=sys.stderr)
+    if discrepancy_count > len(shown):
+        print(f"  ... and {discrepancy_count - len(shown)} more", file=sys.stderr)
 
     print("", file=sys.stderr)
 
@@ -402,10 +1315,6 @@ def main():
     # Apply updates (--mode fix or default behavior)
     print("Applying updates...", file=sys.stderr)
 
-    for story_id, old_status, new_status in discrepancies:
-        comment = f"Updated {datetime.now().strftime('%Y-%m-%d')}"
-        updater.update_story_status(story_id, new_status, comment)
-
     # Add verification timestamp
     updater.add_verification_note()
 
@@ -418,4 +1327,8 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
+    try:
+        main()
+    except PackIndexError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Story Archive Pack - Compressed storage for finished story files
+
+Done/archived stories are moved out of the active story directory into a
+single pack file (.stories.pack) holding one zlib-compressed member per
+story, plus a small JSON index (.stories.pack.idx) recording each story's
+status, offset, length and sha256. Both are dotfiles, so the scripts' *.md
+globs only ever see the stories still in flight.
+
+Readers load the index lazily and decompress a story only when its body is
+needed. If a story exists both as an active file and in the pack (e.g. a
+crash between packing and deleting the original), the active file wins.
+
+The pack is append-only, so extracting a story leaves its member behind as
+dead bytes. Once dead bytes outweigh live ones the live members are copied
+into a fresh pack file (alternating between .stories.pack and
+.stories.pack.compact); the index names the current file, so replacing the
+index is the single commit point and a crash leaves the old pack in use.
+
+The index cannot be rebuilt from the pack (members carry no story ids), so
+an unreadable index raises PackIndexError instead of being treated as empty,
+which would let the next archive run overwrite it.
+
+Archive stories with:
+  python scripts/lib/sprint-status-updater.py --mode archive
+
+Usage:
+  python story_archive.py list                 # List packed stories
+  python story_archive.py cat 7-2-foo          # Print a packed story
+  python story_archive.py extract 7-2-foo      # Restore a story to the active directory
+  python story_archive.py compact              # Drop dead members left by extract
+"""
+
+import os
+import sys
+import json
+import zlib
+import hashlib
+from pathlib import Path
+from typing import Dict, Iterator, Tuple
+
+PACK_FILENAME = '.stories.pack'
+COMPACT_PACK_FILENAME = '.stories.pack.compact'
+INDEX_FILENAME = '.stories.pack.idx'
+INDEX_VERSION = 1
+
+# Statuses that qualify a story for archiving
+ARCHIVABLE_STATUSES = {'done', 'archived'}
+
+
+class PackIndexError(Exception):
+    """The pack index exists but cannot be read"""
+
+
+class StoryPack:
+    """Append-only pack of compressed story files with a lazily loaded index"""
+
+    def __init__(self, story_dir: str):
+        self.story_dir = Path(story_dir)
+        self.index_path = self.story_dir / INDEX_FILENAME
+        self._index = None
+        self._pack_name = PACK_FILENAME
+
+    @property
+    def index(self) -> Dict[str, dict]:
+        """story_id -> {'status', 'offset', 'length', 'size', 'sha256'} (loaded on first use)"""
+        if self._index is None:
+            if not self.index_path.exists():
+                self._index = {}
+                return self._index
+            try:
+                data = json.loads(self.index_path.read_text())
+                if data.get('version') != INDEX_VERSION:
+                    raise ValueError(f"unsupported version {data.get('version')!r}")
+                stories = data['stories']
+                pack_name = data.get('pack', PACK_FILENAME)
+            except (OSError, ValueError, KeyError, AttributeError) as e:
+                raise PackIndexError(
+                    f"Cannot read story pack index {self.index_path}: {e}. "
+                    f"Restore it from a backup before archiving or extracting stories."
+                ) from e
+            self._index = stories
+            self._pack_name = pack_name
+        return self._index
+
+    @property
+    def pack_path(self) -> Path:
+        """Pack file the index currently points at"""
+        self.index
+        return self.story_dir / self._pack_name
+
+    def dead_bytes(self) -> int:
+        """Bytes in the pack file no longer referenced by the index"""
+        if not self.pack_path.exists():
+            return 0
+        live = sum(entry['length'] for entry in self.index.values())
+        return self.pack_path.stat().st_size - live
+
+    def __contains__(self, story_id: str) -> bool:
+        return story_id in self.index
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def statuses(self) -> Iterator[Tuple[str, str]]:
+        """Yield (story_id, status) for every packed story without decompressing"""
+        for story_id, entry in self.index.items():
+            yield story_id, entry['status']
+
+    def read(self, story_id: str) -> str:
+        """Decompress and return a packed story's content"""
+        entry = self.index[story_id]
+        with open(self.pack_path, 'rb') as f:
+            f.seek(entry['offset'])
+            data = zlib.decompress(f.read(entry['length']))
+
+        if hashlib.sha256(data).hexdigest() != entry['sha256']:
+            raise ValueError(f"Checksum mismatch for packed story {story_id}")
+        return data.decode('utf-8')
+
+    def add(self, stories: Dict[str, Tuple[Path, str]]) -> int:
+        """
+        Pack story files and remove the originals
+
+        The pack is appended and fsynced first, then the index is replaced
+        atomically, and only then are the original files deleted.
+
+        Args:
+            stories: story_id -> (path to story file, normalized status)
+
+        Returns:
+            Number of stories packed
+        """
+        if not stories:
+            return 0
+
+        index = dict(self.index)
+        with open(self.pack_path, 'ab') as f:
+            for story_id, (story_file, status) in stories.items():
+                data = story_file.read_bytes()
+                compressed = zlib.compress(data, 9)
+                offset = f.tell()
+                f.write(compressed)
+                index[story_id] = {
+                    'status': status,
+                    'offset': offset,
+                    'length': len(compressed),
+                    'size': len(data),
+                    'sha256': hashlib.sha256(data).hexdigest(),
+                }
+            f.flush()
+            os.fsync(f.fileno())
+
+        self._write_index(index, self._pack_name)
+
+        for story_file, _ in stories.values():
+            story_file.unlink()
+        return len(stories)
+
+    def extract(self, story_id: str) -> Path:
+        """
+        Restore a packed story to the active directory and drop it from the index
+
+        Compacts the pack once more than half of it is dead bytes.
+        """
+        story_file = self.story_dir / f"{story_id}.md"
+        story_file.write_text(self.read(story_id), encoding='utf-8')
+
+        index = dict(self.index)
+        del index[story_id]
+        self._write_index(index, self._pack_name)
+
+        if self.dead_bytes() > sum(entry['length'] for entry in index.values()):
+            self.compact()
+        return story_file
+
+    def compact(self) -> int:
+        """
+        Copy the live members into a fresh pack file and switch the index to it
+
+        Returns:
+            Number of bytes reclaimed
+        """
+        old_path = self.pack_path
+        if not old_path.exists():
+            return 0
+        reclaimed = self.dead_bytes()
+
+        new_name = COMPACT_PACK_FILENAME if self._pack_name == PACK_FILENAME else PACK_FILENAME
+        new_path = self.story_dir / new_name
+        index = {}
+        with open(old_path, 'rb') as src, open(new_path, 'wb') as dst:
+            for story_id, entry in sorted(self.index.items(), key=lambda item: item[1]['offset']):
+                src.seek(entry['offset'])
+                index[story_id] = dict(entry, offset=dst.tell())
+                dst.write(src.read(entry['length']))
+            dst.flush()
+            os.fsync(dst.fileno())
+
+        self._write_index(index, new_name)
+        old_path.unlink()
+        return reclaimed
+
+    def _write_index(self, index: Dict[str, dict], pack_name: str):
+        tmp_path = self.index_path.with_name(self.index_path.name + '.tmp')
+        tmp_path.write_text(json.dumps({'version': INDEX_VERSION, 'pack': pack_name, 'stories': index},
+                                       indent=1))
+        os.replace(tmp_path, self.index_path)
+        self._index = index
+        self._pack_name = pack_name
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Inspect the archived story pack')
+    parser.add_argument('command', choices=['list', 'cat', 'extract', 'compact'])
+    parser.add_argument('story_id', nargs='?', help='Story id (for cat/extract)')
+    parser.add_argument('--story-dir', default='_bmad-output/implementation-artifacts/sprint-artifacts',
+                        help='Path to story files directory')
+    args = parser.parse_args()
+
+    pack = StoryPack(args.story_dir)
+
+    if args.command == 'list':
+        for story_id in sorted(pack.index):
+            entry = pack.index[story_id]
+            print(f"{story_id}\t{entry['status']}\t{entry['size']}\t{entry['length']}")
+        return
+    if args.command == 'compact':
+        print(f"✓ Reclaimed {pack.compact()} bytes ({pack.pack_path})", file=sys.stderr)
+        return
+
+    if not args.story_id:
+        print(f"Error: {args.command} requires a story id", file=sys.stderr)
+        sys.exit(1)
+    if args.story_id not in pack:
+        print(f"Error: {args.story_id} is not in the pack", file=sys.stderr)
+        sys.exit(1)
+
+    if args.command == 'cat':
+        sys.stdout.write(pack.read(args.story_id))
+    else:
+        print(f"✓ Restored {pack.extract(args.story_id)}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    try:
+        main()
+    except PackIndexError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
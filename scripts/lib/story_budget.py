@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Story Budget - Per-file size and CPU-time limits for story checks
+
+A single runaway generated story (tens of MB of copy-paste loops) should not
+stall a whole validation or cleaning run. FileBudget caps how many bytes are
+read from one file and how much CPU time one check may use on it:
+
+  - oversized(): the file is larger than max_bytes and must not be read in full
+  - start()/poll()/tick()/finish(): cooperative CPU deadline per named check;
+    long loops call tick(), which raises BudgetExceeded once the check is over
+    time, and finish() ends the last check so the budget can be reused
+
+Callers turn an exceeded budget into a critical "oversized/pathological"
+verdict for that file instead of finishing the full analysis. A limit of 0
+disables it.
+"""
+
+import time
+from pathlib import Path
+
+DEFAULT_MAX_FILE_BYTES = 1024 * 1024  # 1MB - real stories are 10-50KB
+DEFAULT_MAX_CHECK_SECONDS = 2.0  # CPU seconds per check per file
+
+# Loop iterations between CPU clock reads in tick()
+POLL_INTERVAL = 256
+
+
+class BudgetExceeded(Exception):
+    """A check ran past its CPU-time budget"""
+
+    def __init__(self, check: str, limit: float):
+        super().__init__(f"{check} check exceeded its {limit:g}s CPU budget")
+        self.check = check
+
+
+class FileBudget:
+    """Per-file limits on bytes read and CPU seconds per check"""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_FILE_BYTES,
+                 max_check_seconds: float = DEFAULT_MAX_CHECK_SECONDS):
+        self.max_bytes = max_bytes
+        self.max_check_seconds = max_check_seconds
+        self._check = None
+        self._deadline = None
+        self._ticks = 0
+
+    def oversized(self, size: int) -> bool:
+        return bool(self.max_bytes) and size > self.max_bytes
+
+    def read_prefix(self, path: Path) -> bytes:
+        """Read at most max_bytes from the start of a file"""
+        with open(path, 'rb') as f:
+            return f.read(self.max_bytes) if self.max_bytes else f.read()
+
+    def start(self, check: str):
+        """Finish the previous check (raising if it ran over) and time a new one"""
+        self.finish()
+        self._check = check
+        self._ticks = 0
+        self._deadline = (time.process_time() + self.max_check_seconds
+                          if self.max_check_seconds else None)
+
+    def poll(self):
+        """Raise BudgetExceeded if the current check is past its deadline"""
+        if self._deadline is not None and time.process_time() > self._deadline:
+            self._deadline = None
+            raise BudgetExceeded(self._check, self.max_check_seconds)
+
+    def finish(self):
+        """End the current check, raising BudgetExceeded if it ran over"""
+        try:
+            self.poll()
+        finally:
+            self._deadline = None
+
+    def tick(self):
+        """Cheap poll() for tight loops (reads the clock every POLL_INTERVAL calls)"""
+        self._ticks += 1
+        if self._ticks % POLL_INTERVAL == 0:
+            self.poll()
+
+
+def add_budget_arguments(parser):
+    """Add --max-file-bytes / --max-check-seconds to an argparse parser"""
+    parser.add_argument('--max-file-bytes', type=int, default=DEFAULT_MAX_FILE_BYTES,
+                        help=f'Per-file read budget in bytes; larger files get a partial verdict '
+                             f'(default: {DEFAULT_MAX_FILE_BYTES}, 0 = unlimited)')
+    parser.add_argument('--max-check-seconds', type=float, default=DEFAULT_MAX_CHECK_SECONDS,
+                        help=f'Per-check CPU budget in seconds per file '
+                             f'(default: {DEFAULT_MAX_CHECK_SECONDS:g}, 0 = unlimited)')
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Story Cache - Persistence and change detection for per-story caches
+
+StoryImpactIndex (story_impact.py) and StoryProgressCache (story_progress.py)
+both keep one JSON entry per story next to the story files:
+
+  - load_story_cache() / save_story_cache(): versioned JSON file, written by
+    atomic replace; an unreadable or outdated file loads as empty
+  - iter_stale_story_files(): os.scandir walk yielding only the story files
+    whose mtime or size differ from their cached entry
+
+Entries only need 'mtime_ns' and 'size' keys; the rest is up to the cache.
+"""
+
+import os
+import sys
+import json
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterator, Set, Tuple
+
+
+def load_story_cache(path: Path, version: int, label: str) -> Dict[str, dict]:
+    """
+    Load story_id -> entry from a cache file
+
+    Args:
+        label: Cache name for the warning on an unreadable file (e.g. "impact index")
+
+    Returns:
+        The cached entries, or {} if the file is missing, unreadable or another version
+    """
+    if not path.exists():
+        return {}
+    try:
+        data = json.loads(path.read_text())
+    except (OSError, ValueError) as e:
+        print(f"WARNING: Ignoring unreadable {label} {path}: {e}", file=sys.stderr)
+        return {}
+    if not isinstance(data, dict) or data.get('version') != version:
+        return {}
+    return data.get('stories', {})
+
+
+def save_story_cache(path: Path, version: int, stories: Dict[str, dict]):
+    """
+    Write story_id -> entry to a cache file (atomic replace)
+
+    Each save writes its own temp file, so concurrent runs never share one;
+    the last replace wins, and either result is a complete cache.
+    """
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix='.tmp', dir=path.parent)
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump({'version': version, 'stories': stories}, f)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def iter_stale_story_files(story_dir: Path, stories: Dict[str, dict],
+                           seen: Set[str]) -> Iterator[Tuple[str, Path, os.stat_result]]:
+    """
+    Yield (story_id, path, stat) for story files whose mtime or size changed
+
+    Every story id found in the directory is added to seen, so ids in the
+    cache but not in seen afterwards belong to deleted files.
+    """
+    with os.scandir(story_dir) as entries:
+        for entry in entries:
+            if not entry.name.endswith('.md') or entry.name.startswith('.') or not entry.is_file():
+                continue
+
+            story_id = entry.name[:-3]
+            seen.add(story_id)
+            stat = entry.stat()
+
+            cached = stories.get(story_id)
+            if cached and cached['mtime_ns'] == stat.st_mtime_ns and cached['size'] == stat.st_size:
+                continue
+            yield story_id, Path(entry.path), stat
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Story Impact Index - Inverted index from referenced repo paths to story ids
+
+Story files mention the src/, prisma/ and test/ paths they touch. This index
+maps each referenced path to the stories that mention it, so a list of
+changed source files can be turned into the set of stories to revalidate.
+
+The index is persisted next to the stories and refreshed incrementally:
+only story files whose mtime or size changed since the last refresh are
+re-read (see story_cache.py).
+
+Usage:
+  python story_impact.py --changed src/server/routes/ndas.ts prisma/schema.prisma
+  git diff --name-only main | python story_impact.py --changed-from -
+"""
+
+import re
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, List, Set
+
+from story_cache import iter_stale_story_files, load_story_cache, save_story_cache
+
+INDEX_FILENAME = '.story-impact-index.json'
+INDEX_VERSION = 1
+
+# Repo paths a story can reference, e.g. `src/server/routes/ndas.ts` or `prisma/`
+PATH_PATTERN = re.compile(r'(?<![\w./-])(?:\./)?((?:src|prisma|tests?)/[\w./@\[\]-]*)')
+
+
+def normalize_path(path: str) -> str:
+    """Normalize a referenced or changed path for lookups"""
+    path = path.strip().replace('\\', '/')
+    if path.startswith('./'):
+        path = path[2:]
+    return path.rstrip('/.')
+
+
+def extract_paths(content: str) -> Set[str]:
+    """Extract the repo paths a story references"""
+    paths = set()
+    for match in PATH_PATTERN.finditer(content):
+        path = normalize_path(match.group(1))
+        if path:
+            paths.add(path)
+    return paths
+
+
+def read_changed_paths(path_args: List[str] = None, changed_from: str = None) -> List[str]:
+    """Collect changed paths from CLI arguments and/or a file ('-' for stdin)"""
+    changed = list(path_args or [])
+    if changed_from:
+        stream = sys.stdin if changed_from == '-' else open(changed_from)
+        try:
+            changed.extend(line.strip() for line in stream if line.strip())
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+    return changed
+
+
+class StoryImpactIndex:
+    """Inverted index of referenced repo path -> story ids, kept on disk"""
+
+    def __init__(self, story_dir: str, index_path: str = None):
+        self.story_dir = Path(story_dir)
+        self.index_path = Path(index_path) if index_path else self.story_dir / INDEX_FILENAME
+        # story_id -> {'mtime_ns': int, 'size': int, 'paths': [str]}
+        self.stories: Dict[str, dict] = {}
+        # path -> {story_id}
+        self.by_path: Dict[str, Set[str]] = {}
+        self.dirty = False
+
+        self._load()
+
+    def _load(self):
+        for story_id, entry in load_story_cache(self.index_path, INDEX_VERSION, 'impact index').items():
+            self._set_story(story_id, entry)
+
+    def _set_story(self, story_id: str, entry: dict):
+        self._drop_story(story_id)
+        self.stories[story_id] = entry
+        for path in entry['paths']:
+            self.by_path.setdefault(path, set()).add(story_id)
+
+    def _drop_story(self, story_id: str):
+        entry = self.stories.pop(story_id, None)
+        if entry is None:
+            return
+        for path in entry['paths']:
+            story_ids = self.by_path.get(path)
+            if story_ids is not None:
+                story_ids.discard(story_id)
+                if not story_ids:
+                    del self.by_path[path]
+
+    def refresh(self) -> int:
+        """
+        Bring the index up to date with the story directory
+
+        Returns:
+            Number of story files (re)indexed
+        """
+        seen = set()
+        reindexed = 0
+
+        for story_id, story_file, stat in iter_stale_story_files(self.story_dir, self.stories, seen):
+            try:
+                content = story_file.read_text(encoding='utf-8', errors='replace')
+            except OSError as e:
+                print(f"ERROR reading {story_file.name}: {e}", file=sys.stderr)
+                continue
+
+            self._set_story(story_id, {
+                'mtime_ns': stat.st_mtime_ns,
+                'size': stat.st_size,
+                'paths': sorted(extract_paths(content)),
+            })
+            reindexed += 1
+
+        for story_id in set(self.stories) - seen:
+            self._drop_story(story_id)
+            reindexed += 1
+
+        if reindexed:
+            self.dirty = True
+        return reindexed
+
+    def save(self):
+        """Persist the index if it changed (atomic replace)"""
+        if not self.dirty:
+            return
+        save_story_cache(self.index_path, INDEX_VERSION, self.stories)
+        self.dirty = False
+
+    def impacted_stories(self, changed_paths: Iterable[str]) -> Set[str]:
+        """
+        Return the ids of stories that reference any of the changed paths
+
+        A story referencing a directory (e.g. `src/server/middleware/`) is
+        impacted by every change below it.
+        """
+        impacted = set()
+        for changed in changed_paths:
+            path = normalize_path(changed)
+            while path:
+                impacted.update(self.by_path.get(path, ()))
+                path = path.rpartition('/')[0]
+        return impacted
+
+
+def load_impacted_stories(story_dir: str, changed_paths: Iterable[str]) -> Set[str]:
+    """Refresh the on-disk index for story_dir and look up the impacted stories"""
+    index = StoryImpactIndex(story_dir)
+    reindexed = index.refresh()
+    index.save()
+    impacted = index.impacted_stories(changed_paths)
+    print(f"✓ Impact index: {len(index.stories)} stories, {len(index.by_path)} paths "
+          f"({reindexed} re-indexed), {len(impacted)} impacted", file=sys.stderr)
+    return impacted
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='List stories impacted by changed source paths')
+    parser.add_argument('--story-dir', default='_bmad-output/implementation-artifacts/sprint-artifacts',
+                        help='Path to story files directory')
+    parser.add_argument('--changed', nargs='+', metavar='PATH', help='Changed repo paths')
+    parser.add_argument('--changed-from', metavar='FILE',
+                        help="Read changed paths from FILE, one per line ('-' for stdin)")
+    args = parser.parse_args()
+
+    changed = read_changed_paths(args.changed, args.changed_from)
+    if not changed:
+        print("Error: Must specify --changed PATH... or --changed-from FILE", file=sys.stderr)
+        sys.exit(1)
+
+    for story_id in sorted(load_impacted_stories(args.story_dir, changed)):
+        print(story_id)
+
+
+if __name__ == '__main__':
+    main()
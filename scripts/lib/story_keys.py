@@ -0,0 +1,15 @@
+#!/usr/bin/env python3
+"""
+Story Keys - Parsing helpers for sprint-status.yaml story ids
+
+Story ids look like "7-2-foo" (epic 7, story 2) or "19-4a-bar"; shared by
+sprint-status-updater.py and the story caches so they agree on epics.
+"""
+
+import re
+
+
+def story_epic(story_id: str) -> str:
+    """Return the epic number for a story id (e.g. "7" for "7-2-foo"), or None"""
+    epic_match = re.match(r'^(\d+[a-z]?)-', story_id)
+    return epic_match.group(1) if epic_match else None
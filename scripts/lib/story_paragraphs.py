@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Story Paragraphs - Streaming paragraph splitting and fingerprint counting
+
+  - iter_paragraphs(): split a stream of text chunks on blank lines ("\\n\\n"),
+    yielding exactly what str.split('\\n\\n') would, one paragraph at a time
+  - iter_text_chunks(): decode a binary file incrementally with universal
+    newlines, optionally hashing the raw bytes as they are read
+  - ParagraphCounter: occurrence counts keyed by 64-bit paragraph fingerprints
+
+Repetition checks only need to know how often each distinct paragraph
+occurs, so the text of a repeated paragraph is kept once no matter how many
+copies a runaway file contains. Fingerprint hits are verified against that
+stored text, so a 64-bit collision can never merge two different paragraphs.
+"""
+
+import codecs
+import hashlib
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Characters read per chunk when streaming a story file
+CHUNK_SIZE = 64 * 1024
+
+
+def fingerprint(paragraph: str) -> int:
+    """Return a 64-bit fingerprint of a paragraph"""
+    return int.from_bytes(hashlib.blake2b(paragraph.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+def iter_paragraphs(chunks: Iterable[str]) -> Iterator[str]:
+    """
+    Yield paragraphs separated by '\\n\\n' from a stream of text chunks
+
+    Equivalent to ''.join(chunks).split('\\n\\n') (including empty and
+    trailing paragraphs), but only the current paragraph is buffered.
+    """
+    buffer = ''
+    for chunk in chunks:
+        buffer += chunk
+        start = 0
+        while True:
+            end = buffer.find('\n\n', start)
+            if end < 0:
+                break
+            yield buffer[start:end]
+            start = end + 2
+        buffer = buffer[start:]
+    yield buffer
+
+
+def iter_text_chunks(f, digest=None, chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    """
+    Decode a binary file as UTF-8 in chunks, translating \\r\\n and \\r to \\n
+
+    Args:
+        f: File opened in binary mode
+        digest: Optional hashlib object updated with every raw byte read
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    carry_cr = False
+
+    while True:
+        data = f.read(chunk_size)
+        if digest is not None:
+            digest.update(data)
+        text = decoder.decode(data, final=not data)
+
+        if carry_cr:
+            text = '\r' + text
+        # A trailing \r may be the first half of a \r\n split across chunks
+        carry_cr = bool(data) and text.endswith('\r')
+        if carry_cr:
+            text = text[:-1]
+
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+        if text:
+            yield text
+        if not data:
+            return
+
+
+class ParagraphCounter:
+    """Occurrence counts for distinct paragraphs, keyed by verified 64-bit fingerprints"""
+
+    def __init__(self):
+        # fingerprint -> index of the first paragraph seen with it
+        self._by_fingerprint: Dict[int, int] = {}
+        # Paragraphs whose fingerprint collided with a different paragraph
+        self._collisions: Dict[str, int] = {}
+        self._texts: List[str] = []
+        self._counts: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def _lookup(self, paragraph: str, fp: int) -> Optional[int]:
+        index = self._by_fingerprint.get(fp)
+        if index is None or self._texts[index] == paragraph:
+            return index
+        return self._collisions.get(paragraph)
+
+    def add(self, paragraph: str) -> int:
+        """
+        Count one occurrence of a paragraph
+
+        Returns:
+            Stable index of the distinct paragraph (first-seen order)
+        """
+        fp = fingerprint(paragraph)
+        index = self._lookup(paragraph, fp)
+        if index is not None:
+            self._counts[index] += 1
+            return index
+
+        index = len(self._texts)
+        self._texts.append(paragraph)
+        self._counts.append(1)
+        if fp in self._by_fingerprint:
+            self._collisions[paragraph] = index
+        else:
+            self._by_fingerprint[fp] = index
+        return index
+
+    def index(self, paragraph: str) -> Optional[int]:
+        """Return the index of a counted paragraph, or None if never added"""
+        return self._lookup(paragraph, fingerprint(paragraph))
+
+    def count(self, index: int) -> int:
+        return self._counts[index]
+
+    def items(self) -> Iterator[Tuple[str, int]]:
+        """Yield (paragraph, count) in first-seen order"""
+        return zip(self._texts, self._counts)
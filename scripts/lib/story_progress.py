@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Story Progress Cache - Incremental checkbox counts per story
+
+Keeps each story's checked/total task checkbox counts in a cache next to the
+stories (.story-progress-cache.json). A refresh only re-reads files whose
+mtime or size changed, and only recounts those whose content hash changed,
+so epic-level progress can be summarized without re-reading story bodies.
+
+Counts are written into sprint-status.yaml by:
+  python scripts/lib/sprint-status-updater.py --mode progress
+"""
+
+import hashlib
+from pathlib import Path
+from typing import Dict, Set, Tuple
+
+from story_archive import StoryPack
+from story_cache import iter_stale_story_files, load_story_cache, save_story_cache
+from story_keys import story_epic
+import story_trace
+
+CACHE_FILENAME = '.story-progress-cache.json'
+CACHE_VERSION = 1
+
+
+def count_checkboxes(content: str) -> Tuple[int, int]:
+    """Return (checked, total) task checkboxes in a story"""
+    checked = content.count('- [x]') + content.count('- [X]')
+    return checked, checked + content.count('- [ ]')
+
+
+class StoryProgressCache:
+    """story_id -> checked/total checkbox counts, persisted and refreshed incrementally"""
+
+    def __init__(self, story_dir: str, cache_path: str = None):
+        self.story_dir = Path(story_dir)
+        self.cache_path = Path(cache_path) if cache_path else self.story_dir / CACHE_FILENAME
+        # story_id -> {'mtime_ns', 'size', 'sha1', 'checked', 'total'}
+        self.stories: Dict[str, dict] = load_story_cache(self.cache_path, CACHE_VERSION, 'progress cache')
+        self.dirty = False
+
+    def refresh(self) -> int:
+        """
+        Bring the cache up to date with the story directory
+
+        Stories that were moved into the archive pack keep their last counts.
+
+        Returns:
+            Number of stories recounted
+        """
+        seen = set()
+        recounted = 0
+
+        for story_id, story_file, stat in iter_stale_story_files(self.story_dir, self.stories, seen):
+            data = story_file.read_bytes()
+            story_trace.record_read(story_file, len(data))
+            sha1 = hashlib.sha1(data).hexdigest()
+            cached = self.stories.get(story_id)
+            if cached and cached['sha1'] == sha1:
+                # Touched but unchanged - keep counts, remember the new stat
+                cached.update(mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+                self.dirty = True
+                continue
+
+            checked, total = count_checkboxes(data.decode('utf-8', errors='replace'))
+            self.stories[story_id] = {
+                'mtime_ns': stat.st_mtime_ns,
+                'size': stat.st_size,
+                'sha1': sha1,
+                'checked': checked,
+                'total': total,
+            }
+            recounted += 1
+            self.dirty = True
+
+        gone = set(self.stories) - seen
+        if gone:
+            packed = StoryPack(str(self.story_dir)).index
+            for story_id in gone:
+                if story_id not in packed:
+                    del self.stories[story_id]
+                    self.dirty = True
+
+        return recounted
+
+    def save(self):
+        """Persist the cache if it changed (atomic replace)"""
+        if not self.dirty:
+            return
+        save_story_cache(self.cache_path, CACHE_VERSION, self.stories)
+        self.dirty = False
+
+    def counts(self, story_id: str) -> Tuple[int, int]:
+        """Return cached (checked, total) for a story, or None"""
+        entry = self.stories.get(story_id)
+        return (entry['checked'], entry['total']) if entry else None
+
+    def epic_summary(self, story_ids: Set[str] = None) -> Dict[str, Tuple[int, int, int]]:
+        """Return epic number -> (stories, checked, total) from cached counts"""
+        summary: Dict[str, Tuple[int, int, int]] = {}
+        for story_id, entry in self.stories.items():
+            epic = story_epic(story_id)
+            if epic is None or (story_ids is not None and story_id not in story_ids):
+                continue
+            stories, checked, total = summary.get(epic, (0, 0, 0))
+            summary[epic] = (stories + 1, checked + entry['checked'], total + entry['total'])
+        return summary
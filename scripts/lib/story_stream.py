@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Story Streaming - Constant-memory helpers for walking large story directories
+
+  - iter_story_files(): os.scandir generator over story files (no full listing)
+  - external_sorted(): sorted iteration via an external merge of sorted runs
+  - OnlineStats: running count/mean/min/max/variance without keeping samples
+
+Memory stays bounded by the sort run size, not by the number of stories, so
+the scripts behave the same on a 100-story and a 100k-story directory.
+"""
+
+import os
+import heapq
+import tempfile
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List
+
+# Items held in memory per sorted run before spilling to a temp file
+SORT_RUN_SIZE = 10000
+
+
+def iter_story_files(story_dir, name_filter: Callable[[str], bool] = None) -> Iterator[Path]:
+    """
+    Yield *.md files in story_dir (dotfiles excluded) in directory order
+
+    Args:
+        name_filter: Optional predicate on the file name (e.g. epic prefix)
+    """
+    with os.scandir(story_dir) as entries:
+        for entry in entries:
+            name = entry.name
+            if not name.endswith('.md') or name.startswith('.'):
+                continue
+            if name_filter is not None and not name_filter(name):
+                continue
+            if entry.is_file():
+                yield Path(entry.path)
+
+
+def iter_sorted_story_files(story_dir, name_filter: Callable[[str], bool] = None,
+                            run_size: int = SORT_RUN_SIZE) -> Iterator[Path]:
+    """iter_story_files() in name order, sorted via external_sorted()"""
+    story_dir = Path(story_dir)
+    names = (path.name for path in iter_story_files(story_dir, name_filter))
+    for name in external_sorted(names, run_size):
+        yield story_dir / name
+
+
+def external_sorted(items: Iterable[str], run_size: int = SORT_RUN_SIZE) -> Iterator[str]:
+    """
+    Yield strings in sorted order using at most ~run_size of them in memory
+
+    Items are sorted in runs of run_size; once more than one run is needed,
+    each run is spilled to a temp file and the runs are lazily merged with
+    heapq.merge. Items must not contain newlines.
+    """
+    run: List[str] = []
+    run_files = []
+
+    try:
+        for item in items:
+            run.append(item)
+            if len(run) >= run_size:
+                run_files.append(_spill_run(run))
+                run = []
+
+        if not run_files:
+            yield from sorted(run)
+            return
+
+        if run:
+            run_files.append(_spill_run(run))
+            run = []
+
+        readers = [open(path, encoding='utf-8') for path in run_files]
+        try:
+            streams = [(line[:-1] for line in reader) for reader in readers]
+            yield from heapq.merge(*streams)
+        finally:
+            for reader in readers:
+                reader.close()
+    finally:
+        for path in run_files:
+            os.unlink(path)
+
+
+def _spill_run(run: List[str]) -> str:
+    """Write one sorted run to a temp file and return its path"""
+    fd, path = tempfile.mkstemp(prefix='story-sort-', suffix='.run')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        for item in sorted(run):
+            f.write(item)
+            f.write('\n')
+    return path
+
+
+class OnlineStats:
+    """Running statistics (Welford) for a stream of numbers"""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, value: float):
+        self.count += 1
+        self.total += value
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    @property
+    def variance(self) -> float:
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
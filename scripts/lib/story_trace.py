@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Story Trace - Opt-in invocation tracing for the story scripts
+
+When BMAD_TRACE is set, each run of sprint-status-updater.py,
+validate-stories.py, clean-repetitions.py or add-status-fields.py appends one
+JSON span to the trace file on exit: command, args, epic, files and bytes
+read/written, and duration. Spans are grouped by BMAD_TRACE_RUN, which a
+workflow sets once per run (e.g. per autonomous epic).
+
+  BMAD_TRACE=1                    Trace to .bmad-trace.jsonl in the working directory
+  BMAD_TRACE=/path/to/trace.jsonl Trace to the given file
+  BMAD_TRACE_RUN=epic-7-20260104  Run id recorded on every span (default: "adhoc")
+
+With BMAD_TRACE unset, every function here is a no-op.
+
+Usage:
+  python story_trace.py summarize                       # Aggregate spans per run
+  python story_trace.py summarize --run epic-7-20260104 # One run only
+"""
+
+import os
+import sys
+import json
+import time
+import atexit
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+
+DEFAULT_TRACE_FILE = '.bmad-trace.jsonl'
+
+# Paths listed per span; beyond this only the counts grow
+MAX_TRACED_PATHS = 50
+
+_span = None
+
+
+def trace_path() -> Path:
+    """Return the trace file configured by BMAD_TRACE, or None if tracing is off"""
+    setting = os.environ.get('BMAD_TRACE', '').strip()
+    if not setting or setting == '0':
+        return None
+    return Path(DEFAULT_TRACE_FILE if setting == '1' else setting).resolve()
+
+
+def start(command: str, epic=None):
+    """Open the span for this process; it is written when the process exits"""
+    global _span
+
+    path = trace_path()
+    if path is None or _span is not None:
+        return
+
+    _span = {
+        'run': os.environ.get('BMAD_TRACE_RUN', 'adhoc'),
+        'command': command,
+        'args': sys.argv[1:],
+        'epic': None if epic is None else str(epic),
+        'cwd': os.getcwd(),
+        'pid': os.getpid(),
+        'start': datetime.now().isoformat(timespec='milliseconds'),
+        'files_read': 0,
+        'files_written': 0,
+        'bytes_read': 0,
+        'bytes_written': 0,
+        'read_paths': [],
+        'written_paths': [],
+        '_t0': time.perf_counter(),
+        '_path': path,
+    }
+    atexit.register(_finish)
+
+
+def record_read(path, nbytes: int):
+    """Record a file read by the current span"""
+    if _span is None:
+        return
+    _span['files_read'] += 1
+    _span['bytes_read'] += nbytes
+    if len(_span['read_paths']) < MAX_TRACED_PATHS:
+        _span['read_paths'].append(os.path.abspath(path))
+
+
+def record_write(path, nbytes: int):
+    """Record a file written by the current span"""
+    if _span is None:
+        return
+    _span['files_written'] += 1
+    _span['bytes_written'] += nbytes
+    if len(_span['written_paths']) < MAX_TRACED_PATHS:
+        _span['written_paths'].append(os.path.abspath(path))
+
+
+def _finish():
+    """Append the finished span to the trace file in a single write"""
+    global _span
+    if _span is None:
+        return
+
+    span, _span = _span, None
+    span['duration_s'] = round(time.perf_counter() - span.pop('_t0'), 4)
+    path = span.pop('_path')
+
+    data = (json.dumps(span, ensure_ascii=False) + '\n').encode('utf-8')
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            os.write(fd, data)
+        finally:
+            os.close(fd)
+    except OSError as e:
+        print(f"WARNING: Could not write trace span to {path}: {e}", file=sys.stderr)
+
+
+def iter_spans(path: Path):
+    """Stream spans from a trace file, skipping torn lines"""
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+
+def summarize(path: Path, run: str = None) -> dict:
+    """
+    Aggregate spans per workflow run
+
+    An invocation is counted as redundant when the same command ran with
+    the same args earlier in the run and no span wrote any file in between,
+    i.e. it could only have reproduced the earlier result.
+
+    Returns:
+        Dict of run id -> {'spans', 'duration_s', 'commands': {command: stats},
+                           'redundant': [(command, args, count)]}
+    """
+    runs = {}
+
+    for span in iter_spans(path):
+        if run is not None and span['run'] != run:
+            continue
+
+        summary = runs.setdefault(span['run'], {
+            'spans': 0,
+            'duration_s': 0.0,
+            'commands': defaultdict(lambda: {'count': 0, 'duration_s': 0.0,
+                                             'bytes_read': 0, 'bytes_written': 0}),
+            '_since_write': set(),
+            '_redundant': defaultdict(int),
+        })
+        summary['spans'] += 1
+        summary['duration_s'] += span['duration_s']
+
+        stats = summary['commands'][span['command']]
+        stats['count'] += 1
+        stats['duration_s'] += span['duration_s']
+        stats['bytes_read'] += span['bytes_read']
+        stats['bytes_written'] += span['bytes_written']
+
+        key = (span['command'], ' '.join(span['args']))
+        if key in summary['_since_write']:
+            summary['_redundant'][key] += 1
+        if span['files_written']:
+            summary['_since_write'].clear()
+        else:
+            summary['_since_write'].add(key)
+
+    for summary in runs.values():
+        summary['commands'] = dict(summary['commands'])
+        summary['redundant'] = sorted(
+            ((command, args, count) for (command, args), count in summary.pop('_redundant').items()),
+            key=lambda item: -item[2],
+        )
+        summary.pop('_since_write')
+
+    return runs
+
+
+def print_summary(runs: dict):
+    for run_id, summary in sorted(runs.items()):
+        print("="*60)
+        print(f"RUN {run_id}: {summary['spans']} invocations, {summary['duration_s']:.2f}s total")
+        print("="*60)
+        print(f"{'Command':<26}{'Calls':>6}{'Time (s)':>10}{'Read KB':>10}{'Written KB':>12}")
+        by_time = sorted(summary['commands'].items(), key=lambda item: -item[1]['duration_s'])
+        for command, stats in by_time:
+            print(f"{command:<26}{stats['count']:>6}{stats['duration_s']:>10.2f}"
+                  f"{stats['bytes_read'] // 1024:>10}{stats['bytes_written'] // 1024:>12}")
+
+        if summary['redundant']:
+            print("\n⚠️  Redundant invocations (no writes since an identical call):")
+            for command, args, count in summary['redundant'][:20]:
+                print(f"  {count}x {command} {args}")
+        print("")
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Summarize story script trace spans')
+    parser.add_argument('command', choices=['summarize'])
+    parser.add_argument('--trace', help=f'Trace file (default: $BMAD_TRACE or {DEFAULT_TRACE_FILE})')
+    parser.add_argument('--run', help='Only summarize this run id')
+    args = parser.parse_args()
+
+    path = Path(args.trace) if args.trace else (trace_path() or Path(DEFAULT_TRACE_FILE))
+    if not path.exists():
+        print(f"Error: Trace file not found: {path}", file=sys.stderr)
+        sys.exit(1)
+
+    print_summary(summarize(path, args.run))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""
+Shared fixtures for the story tooling tests
+
+The scripts have hyphenated file names, so they are loaded by path rather
+than imported. scripts/lib is put on sys.path the same way the
+_bmad/scripts entry points do it.
+"""
+
+import sys
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+LIB_DIR = REPO_ROOT / 'scripts' / 'lib'
+BMAD_SCRIPTS_DIR = REPO_ROOT / '_bmad' / 'scripts'
+
+sys.path.insert(0, str(LIB_DIR))
+
+
+def load_script(path: Path):
+    """Load a script such as clean-repetitions.py as a fresh module"""
+    spec = importlib.util.spec_from_file_location(path.stem.replace('-', '_'), path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def clean_repetitions():
+    return load_script(BMAD_SCRIPTS_DIR / 'clean-repetitions.py')
+
+
+@pytest.fixture
+def validate_stories():
+    return load_script(BMAD_SCRIPTS_DIR / 'validate-stories.py')
+
+
+@pytest.fixture
+def updater_module():
+    return load_script(LIB_DIR / 'sprint-status-updater.py')
+
+
+@pytest.fixture
+def story_dir(tmp_path, monkeypatch):
+    """Empty story directory at the scripts' default location, with cwd at its project root"""
+    monkeypatch.chdir(tmp_path)
+    path = tmp_path / '_bmad-output' / 'implementation-artifacts' / 'sprint-artifacts'
+    path.mkdir(parents=True)
+    return path
+
+
+@pytest.fixture
+def stress_module():
+    return load_script(LIB_DIR / 'sprint-status-stress.py')
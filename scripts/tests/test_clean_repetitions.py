@@ -0,0 +1,108 @@
+"""Transactional rewrite and rollback in clean-repetitions.py"""
+
+import os
+import sys
+import json
+from pathlib import Path
+
+import pytest
+
+REPEATED = "This paragraph was pasted again and again by a runaway generation loop."
+UNIQUE = "A paragraph that only appears once in the story, long enough to be tracked."
+
+
+def write_story(story_dir: Path, name: str, copies: int) -> Path:
+    path = story_dir / name
+    path.write_text("# Story\n\n" + "\n\n".join([REPEATED] * copies + [UNIQUE]) + "\n")
+    return path
+
+
+def test_clean_batch_dry_run_leaves_files(clean_repetitions, story_dir):
+    story = write_story(story_dir, "1-1-loop.md", 4)
+    before = story.read_bytes()
+
+    processed, cleaned, removed, skipped = clean_repetitions.clean_batch([story], dry_run=True)
+
+    assert (processed, cleaned, removed, skipped) == (1, 1, 3, 0)
+    assert story.read_bytes() == before
+    assert not clean_repetitions.TXN_DIR.exists()
+
+
+def test_clean_batch_commits_and_rollback_restores(clean_repetitions, story_dir):
+    story = write_story(story_dir, "1-1-loop.md", 4)
+    untouched = write_story(story_dir, "1-2-fine.md", 2)
+    before, untouched_before = story.read_bytes(), untouched.read_bytes()
+
+    _, cleaned, removed, _ = clean_repetitions.clean_batch([story, untouched], dry_run=False)
+
+    assert (cleaned, removed) == (1, 3)
+    assert story.read_text().count(REPEATED) == 1
+    assert untouched.read_bytes() == untouched_before
+    assert not list(story_dir.glob(".*.clean-tmp"))
+
+    manifest = next(clean_repetitions.TXN_DIR.glob("*/manifest.json"))
+    assert clean_repetitions.rollback(manifest) == 1
+    assert story.read_bytes() == before
+
+
+def test_failed_commit_restores_every_file(clean_repetitions, story_dir, monkeypatch):
+    first = write_story(story_dir, "1-1-loop.md", 4)
+    second = write_story(story_dir, "1-2-loop.md", 5)
+    originals = {first: first.read_bytes(), second: second.read_bytes()}
+
+    real_replace = os.replace
+
+    def failing_replace(src, dst):
+        if str(src).endswith("1-2-loop.md.clean-tmp"):
+            raise OSError("disk full")
+        real_replace(src, dst)
+
+    monkeypatch.setattr(clean_repetitions.os, "replace", failing_replace)
+
+    with pytest.raises(OSError):
+        clean_repetitions.clean_batch([first, second], dry_run=False)
+
+    for path, content in originals.items():
+        assert path.read_bytes() == content
+    assert not list(story_dir.glob(".*.clean-tmp"))
+
+
+def test_changed_original_aborts_without_changes(clean_repetitions, story_dir):
+    story = write_story(story_dir, "1-1-loop.md", 4)
+    plan = clean_repetitions.plan_rewrite(story, dry_run=False)
+    story.write_text(story.read_text() + "\nEdited meanwhile.\n")
+    edited = story.read_bytes()
+
+    with pytest.raises(RuntimeError):
+        clean_repetitions.commit_rewrites([plan])
+
+    assert story.read_bytes() == edited
+    assert not Path(plan['staged']).exists()
+
+
+def test_old_transactions_are_pruned(clean_repetitions, story_dir):
+    story = write_story(story_dir, "1-1-loop.md", 4)
+    for copies in (4, 5, 6):
+        story.write_text(story.read_text() + "\n\n" + "\n\n".join([REPEATED] * copies))
+        clean_repetitions.clean_batch([story], dry_run=False, keep_transactions=2)
+
+    kept = sorted(clean_repetitions.TXN_DIR.iterdir())
+    assert len(kept) == 2
+    manifest = kept[-1] / "manifest.json"
+    assert json.loads(manifest.read_text())['state'] == 'committed'
+
+
+def test_worker_failure_discards_in_flight_staged_files(clean_repetitions, story_dir, monkeypatch):
+    # Worker processes look plan_rewrite up by module name
+    monkeypatch.setitem(sys.modules, clean_repetitions.__name__, clean_repetitions)
+    bad = story_dir / "1-0-binary.md"
+    bad.write_bytes(b"\xff\xfe not utf-8 \xff")
+    stories = [bad] + [write_story(story_dir, f"1-{n}-loop.md", 4) for n in range(1, 9)]
+    originals = {path: path.read_bytes() for path in stories}
+
+    with pytest.raises(UnicodeDecodeError):
+        clean_repetitions.clean_batch(stories, dry_run=False, jobs=2)
+
+    for path, content in originals.items():
+        assert path.read_bytes() == content
+    assert not list(story_dir.glob(".*.clean-tmp"))
@@ -0,0 +1,88 @@
+"""Set-based --mode reconcile in sprint-status-updater.py"""
+
+SPRINT_STATUS = """development_status:
+  # Epic 5: Search
+  epic-5: done
+  5-1-search: done
+  5-2-old-idea: backlog
+  epic-5-retrospective: optional
+
+  # Epic 6: Audit & Compliance - epic line after its stories
+  6-1-centralized-audit-log-viewer: done
+  6-2-access-control-summary-view: done
+  epic-6: done
+
+  # Epic 7: Templates
+  epic-7: in-progress
+  7-1-templates: in-progress
+  8-1-strays-into-epic-7: review
+  7-2-preview-before-send: review
+
+  epic-8: in-progress
+"""
+
+STORY_FILES = [
+    '5-1-search', '6-1-centralized-audit-log-viewer', '6-2-access-control-summary-view',
+    '7-1-templates', '7-2-preview-before-send', '7-3-not-tracked', '8-1-strays-into-epic-7',
+]
+
+
+def make_updater(updater_module, story_dir, history_log=None):
+    sprint_status = story_dir / 'sprint-status.yaml'
+    if not sprint_status.exists():
+        sprint_status.write_text(SPRINT_STATUS)
+        for story_id in STORY_FILES:
+            (story_dir / f"{story_id}.md").write_text(f"# {story_id}\n\nStatus: drafted\n")
+    if history_log is None:
+        return updater_module.SprintStatusUpdater(str(sprint_status))
+    return updater_module.SprintStatusUpdater(str(sprint_status), history_log)
+
+
+def test_reconcile_reports_drift(updater_module, story_dir):
+    report = updater_module.reconcile(make_updater(updater_module, story_dir), str(story_dir))
+
+    # Slugs mentioning audit/summary/preview are still stories
+    assert report['orphans'] == [('5-2-old-idea', 'backlog')]
+    assert report['missing'] == [('7-3-not-tracked', 'ready-for-dev')]
+    # epic-6 listed after its stories is not a misplacement; 8-1 inside epic 7's run is
+    assert report['misplaced'] == [('8-1-strays-into-epic-7', '7')]
+    assert report['no_epic'] == []
+    assert report['empty_epics'] == []
+
+
+def test_prune_and_insert_apply_in_one_save_and_are_logged(updater_module, story_dir, tmp_path):
+    history_log = tmp_path / 'history.tsv'
+    updater = make_updater(updater_module, story_dir, history_log)
+    report = updater_module.reconcile(updater, str(story_dir))
+
+    removed, added = updater.apply_batch(
+        {story_id for story_id, _ in report['orphans']},
+        {'epic-7': report['missing']},
+    )
+    updater.save(backup=False)
+
+    assert (removed, added) == (1, 1)
+    content = (story_dir / 'sprint-status.yaml').read_text()
+    assert '5-2-old-idea' not in content
+    assert '  epic-7: in-progress\n  7-3-not-tracked: ready-for-dev\n' in content
+    assert '6-1-centralized-audit-log-viewer: done' in content
+    assert [(key, old, new) for _, key, old, new in updater_module.iter_history(history_log)] == [
+        ('5-2-old-idea', 'backlog', None),
+        ('7-3-not-tracked', None, 'ready-for-dev'),
+    ]
+
+    again = updater_module.reconcile(make_updater(updater_module, story_dir), str(story_dir))
+    assert again['orphans'] == [] and again['missing'] == []
+
+
+def test_pruned_stories_leave_the_epic_total(updater_module, story_dir, tmp_path):
+    history_log = tmp_path / 'history.tsv'
+    updater = make_updater(updater_module, story_dir, history_log)
+    updater.apply_batch({'5-2-old-idea'}, {})
+    updater.save(backup=False)
+
+    yaml_index = make_updater(updater_module, story_dir).index_development_status()
+    report = updater_module.history_report(yaml_index, '5', history_log)
+
+    assert report['5']['total'] == 1
+    assert report['5']['burndown'][-1][1] == 0
@@ -0,0 +1,17 @@
+"""Concurrent --mode fix runs driven by sprint-status-stress.py"""
+
+import pytest
+
+
+def test_concurrent_updaters_lose_no_updates(stress_module):
+    report = stress_module.run_stress(agents=3, rounds=3, epics=1, stories_per_epic=3)
+
+    assert report['runs'] == 9
+    assert report['updater_failures'] == 0
+    assert report['lost_updates'] == []
+    assert report['corruption'] == {'missing': [], 'duplicated': [], 'unknown': []}
+
+
+def test_more_agents_than_stories_is_rejected(stress_module):
+    with pytest.raises(ValueError, match='3 agents'):
+        stress_module.run_stress(agents=3, rounds=1, epics=1, stories_per_epic=2)
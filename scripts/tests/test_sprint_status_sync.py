@@ -0,0 +1,150 @@
+"""Two-way --mode sync in sprint-status-updater.py"""
+
+import sys
+import argparse
+import subprocess
+
+import pytest
+
+from conftest import LIB_DIR
+
+SPRINT_STATUS = """development_status:
+  # Epic 7: Templates
+  epic-7: in-progress
+  7-1-heading-status: done
+  7-2-no-status: review
+"""
+
+
+def make_fixture(story_dir):
+    sprint_status = story_dir / 'sprint-status.yaml'
+    sprint_status.write_text(SPRINT_STATUS)
+    (story_dir / '7-1-heading-status.md').write_text(
+        "# Story 7.1\n\n## Status\nready-for-dev\n\n## Story\n\nBody.\n"
+    )
+    (story_dir / '7-2-no-status.md').write_text("# Story 7.2\n\n## Story\n\nBody.\n")
+    return sprint_status
+
+
+def test_sync_rewrites_status_heading_in_place(updater_module, story_dir):
+    updater = updater_module.SprintStatusUpdater(str(make_fixture(story_dir)))
+
+    report = updater_module.sync_statuses(updater, str(story_dir), conflict='yaml')
+
+    assert report['restamp'] == [('7-1-heading-status', 'ready-for-dev', 'done')]
+    content = (story_dir / '7-1-heading-status.md').read_text()
+    assert content == "# Story 7.1\n\n## Status\ndone\n\n## Story\n\nBody.\n"
+    assert '**Status:**' not in content
+
+
+def test_sync_stamps_missing_status_without_extra_blank_lines(updater_module, story_dir):
+    updater = updater_module.SprintStatusUpdater(str(make_fixture(story_dir)))
+
+    report = updater_module.sync_statuses(updater, str(story_dir), conflict='yaml')
+
+    assert report['stamp'] == [('7-2-no-status', None, 'review')]
+    content = (story_dir / '7-2-no-status.md').read_text()
+    assert content == "# Story 7.2\n\n**Status:** review\n\n## Story\n\nBody.\n"
+
+
+def test_sync_story_side_wins_updates_yaml(updater_module, story_dir):
+    sprint_status = make_fixture(story_dir)
+    updater = updater_module.SprintStatusUpdater(str(sprint_status))
+
+    report = updater_module.sync_statuses(updater, str(story_dir), conflict='story')
+    updater.save(backup=False)
+
+    assert report['update'] == [('7-1-heading-status', 'done', 'ready-for-dev')]
+    assert updater_module.SprintStatusUpdater(str(sprint_status)).index_development_status()[
+        '7-1-heading-status'][1] == 'ready-for-dev'
+
+
+def test_transitions_go_to_the_configured_history_log(updater_module, story_dir, tmp_path):
+    history_log = tmp_path / 'custom-history.tsv'
+    updater = updater_module.SprintStatusUpdater(str(make_fixture(story_dir)), history_log)
+
+    updater_module.sync_statuses(updater, str(story_dir), conflict='story')
+    updater.save(backup=False)
+
+    assert [(key, old, new) for _, key, old, new in updater_module.iter_history(history_log)] == [
+        ('7-1-heading-status', 'done', 'ready-for-dev'),
+    ]
+    assert not updater_module.HISTORY_LOG.exists()
+
+
+def run_updater(*args):
+    return subprocess.run([sys.executable, str(LIB_DIR / 'sprint-status-updater.py'), *args],
+                          capture_output=True, text=True)
+
+
+@pytest.mark.parametrize('mode', ['sync', 'archive', 'progress', 'reconcile'])
+def test_validate_reports_without_saving_or_locking(mode, story_dir):
+    sprint_status = make_fixture(story_dir)
+    before = sprint_status.read_text()
+    stories_before = {path.name: path.read_text() for path in story_dir.glob('*.md')}
+
+    result = run_updater('--mode', mode, '--validate', '--prune', '--insert')
+
+    assert result.returncode in (0, 1), result.stderr
+    assert sprint_status.read_text() == before
+    assert {path.name: path.read_text() for path in story_dir.glob('*.md')} == stories_before
+    assert not (story_dir / 'sprint-status.yaml.lock').exists()
+    assert not (story_dir.parents[2] / '.sprint-status-backups').exists()
+
+
+def test_sync_validate_fails_on_drift(story_dir):
+    make_fixture(story_dir)
+
+    assert run_updater('--mode', 'sync', '--validate').returncode == 1
+
+
+@pytest.mark.parametrize('argv, expected', [
+    (['--mode', 'fix'], True),
+    (['--mode', 'sync', '--validate'], False),
+    (['--mode', 'archive', '--dry-run'], False),
+    (['--mode', 'progress'], True),
+    (['--mode', 'reconcile'], False),
+    (['--mode', 'reconcile', '--prune'], True),
+    (['--mode', 'reconcile', '--insert', '--validate'], False),
+    (['--mode', 'history'], False),
+])
+def test_writes_only_when_the_run_saves(updater_module, argv, expected):
+    args = argparse.Namespace(mode='validate', dry_run=False, validate=False, prune=False, insert=False)
+    for flag in argv:
+        if flag.startswith('--') and flag != '--mode':
+            setattr(args, flag[2:].replace('-', '_'), True)
+    args.mode = argv[1]
+
+    assert updater_module.writes(args) is expected
+
+
+def test_sync_includes_stories_with_audit_in_the_slug(updater_module, story_dir):
+    sprint_status = make_fixture(story_dir)
+    sprint_status.write_text(sprint_status.read_text() + "  7-3-audit-log-summary-view: review\n")
+    (story_dir / '7-3-audit-log-summary-view.md').write_text("# Story 7.3\n\nStatus: done\n")
+    (story_dir / 'epic-7-retro-REPORT.md').write_text("# Not a story\n\nStatus: done\n")
+    updater = updater_module.SprintStatusUpdater(str(sprint_status))
+
+    report = updater_module.sync_statuses(updater, str(story_dir), conflict='story')
+
+    assert ('7-3-audit-log-summary-view', 'review', 'done') in report['update']
+    assert not [entry for entry in report['untracked'] if entry[0].startswith('epic-')]
+
+
+def test_sync_adds_untracked_stories_under_their_epic_in_one_pass(updater_module, story_dir, monkeypatch):
+    sprint_status = make_fixture(story_dir)
+    for n in (4, 5):
+        (story_dir / f"7-{n}-new.md").write_text(f"# Story 7.{n}\n\nStatus: drafted\n")
+    (story_dir / '9-1-no-epic.md').write_text("# Story 9.1\n\nStatus: review\n")
+    updater = updater_module.SprintStatusUpdater(str(sprint_status))
+    monkeypatch.setattr(updater, '_add_story_entry', None)  # Per-entry rescans are not used
+
+    report = updater_module.sync_statuses(updater, str(story_dir), conflict='story')
+
+    assert report['add'] == [('7-4-new', None, 'ready-for-dev'), ('7-5-new', None, 'ready-for-dev')]
+    assert report['untracked'] == [('9-1-no-epic', None, 'review')]
+    assert [line.split('  #')[0] for line in updater.lines[2:5]] == [
+        '  epic-7: in-progress',
+        '  7-4-new: ready-for-dev',
+        '  7-5-new: ready-for-dev',
+    ]
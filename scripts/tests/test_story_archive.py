@@ -0,0 +1,75 @@
+"""Archiving finished stories into the story pack and extracting them again"""
+
+import pytest
+
+from story_archive import COMPACT_PACK_FILENAME, INDEX_FILENAME, PackIndexError, StoryPack
+
+SPRINT_STATUS = """development_status:
+  # Epic 3: Reports
+  epic-3: in-progress
+  3-1-export: done
+  3-2-charts: done
+  3-3-filters: in-progress
+  3-4-audit-summary: done
+"""
+
+
+@pytest.fixture
+def archived(updater_module, story_dir):
+    sprint_status = story_dir / 'sprint-status.yaml'
+    sprint_status.write_text(SPRINT_STATUS)
+    bodies = {
+        '3-1-export': "# Story 3.1\n\nStatus: done\n\n" + "Export body.\n" * 200,
+        '3-2-charts': "# Story 3.2\n\nStatus: done\n\n" + "Charts body.\n" * 200,
+        '3-3-filters': "# Story 3.3\n\nStatus: in-progress\n",
+        '3-4-audit-summary': "# Story 3.4\n\nStatus: done\n",
+    }
+    for story_id, body in bodies.items():
+        (story_dir / f"{story_id}.md").write_text(body)
+
+    updater = updater_module.SprintStatusUpdater(str(sprint_status))
+    updater_module.archive_finished_stories(updater, str(story_dir))
+    return bodies
+
+
+def test_archive_moves_done_stories_into_the_pack(story_dir, archived):
+    pack = StoryPack(str(story_dir))
+
+    assert sorted(pack.statuses()) == [('3-1-export', 'done'), ('3-2-charts', 'done'),
+                                       ('3-4-audit-summary', 'done')]
+    assert not (story_dir / '3-1-export.md').exists()
+    assert (story_dir / '3-3-filters.md').exists()
+    assert pack.read('3-2-charts') == archived['3-2-charts']
+
+
+def test_extract_restores_the_story_and_compacts_dead_members(story_dir, archived):
+    pack = StoryPack(str(story_dir))
+
+    pack.extract('3-1-export')
+    assert (story_dir / '3-1-export.md').read_text() == archived['3-1-export']
+    assert '3-1-export' not in pack
+    assert pack.dead_bytes() > 0  # Half the pack is not yet "more than half"
+
+    pack.extract('3-2-charts')
+    assert (story_dir / '3-2-charts.md').read_text() == archived['3-2-charts']
+    assert pack.pack_path.name == COMPACT_PACK_FILENAME
+    assert pack.dead_bytes() == 0
+    assert sorted(StoryPack(str(story_dir)).index) == ['3-4-audit-summary']
+
+
+def test_compact_keeps_live_members_readable(story_dir, archived):
+    pack = StoryPack(str(story_dir))
+    story_file = pack.extract('3-1-export')
+    story_file.unlink()
+
+    assert pack.compact() > 0
+    reopened = StoryPack(str(story_dir))
+    assert reopened.read('3-2-charts') == archived['3-2-charts']
+    assert not (story_dir / '.stories.pack').exists()
+
+
+def test_corrupt_index_fails_instead_of_reading_as_empty(story_dir, archived):
+    (story_dir / INDEX_FILENAME).write_text('{"version": 1, "stories": {')
+
+    with pytest.raises(PackIndexError, match='Cannot read story pack index'):
+        StoryPack(str(story_dir)).index
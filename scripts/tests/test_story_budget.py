@@ -0,0 +1,77 @@
+"""Per-check CPU deadlines in story_budget.py across consecutive files"""
+
+import time
+
+import pytest
+
+from story_budget import BudgetExceeded, FileBudget
+
+STORY = """# Story 1.1
+
+## Story
+
+As a user I want a story that passes every structural check of the validator.
+
+## Acceptance Criteria
+
+**Given** a **When** b **Then** c **Given** d **When** e **Then** f
+
+## Tasks
+
+- [ ] One
+
+## Dev Notes
+
+None.
+"""
+
+
+def burn_cpu(seconds: float):
+    end = time.process_time() + seconds
+    while time.process_time() < end:
+        pass
+
+
+def test_finish_clears_the_deadline():
+    budget = FileBudget(max_check_seconds=0.01)
+    budget.start("first")
+    budget.finish()
+    burn_cpu(0.03)
+
+    budget.start("second")  # Must not poll the finished check's deadline
+    budget.finish()
+
+
+def test_finish_raises_for_an_overrun_check_once():
+    budget = FileBudget(max_check_seconds=0.01)
+    budget.start("slow")
+    burn_cpu(0.03)
+
+    with pytest.raises(BudgetExceeded, match='slow'):
+        budget.finish()
+    budget.start("next")
+
+
+def test_idle_time_between_files_is_not_charged(validate_stories):
+    budget = FileBudget(max_check_seconds=0.05)
+
+    for _ in range(2):
+        errors = validate_stories.validate_story_content("1-1-a.md", STORY, 6000, budget)
+        assert not [e for e in errors if 'pathological' in e.message]
+        burn_cpu(0.1)
+
+
+def test_clean_budget_is_reusable_after_a_rewrite(clean_repetitions, story_dir):
+    budget = FileBudget(max_check_seconds=0.05)
+    paragraph = "This paragraph was pasted again and again by a runaway generation loop."
+    stories = []
+    for name in ("1-1-a.md", "1-2-b.md"):
+        stories.append(story_dir / name)
+        stories[-1].write_text("\n\n".join([paragraph] * 4) + "\n")
+
+    first = clean_repetitions.plan_rewrite(stories[0], dry_run=False, budget=budget)
+    burn_cpu(0.1)
+    second = clean_repetitions.plan_rewrite(stories[1], dry_run=False, budget=budget)
+
+    assert first['skipped'] is None and second['skipped'] is None
+    assert second['removed'] == 3
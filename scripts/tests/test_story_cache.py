@@ -0,0 +1,76 @@
+"""Incremental refresh of the story caches built on story_cache.py"""
+
+import os
+import sys
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+from conftest import LIB_DIR
+from story_impact import StoryImpactIndex
+from story_progress import StoryProgressCache
+
+
+def write_story(path, content, mtime_ns):
+    path.write_text(content)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_progress_cache_recounts_only_changed_stories(story_dir):
+    write_story(story_dir / '4-1-a.md', "- [x] one\n- [ ] two\n", 1_000_000_000)
+    write_story(story_dir / '4-2-b.md', "- [x] one\n", 1_000_000_000)
+    cache = StoryProgressCache(str(story_dir))
+    assert cache.refresh() == 2
+    cache.save()
+
+    reloaded = StoryProgressCache(str(story_dir))
+    assert reloaded.refresh() == 0
+    write_story(story_dir / '4-1-a.md', "- [x] one\n- [x] two\n", 2_000_000_000)
+    # Touched with identical content: new stat is remembered, counts are kept
+    write_story(story_dir / '4-2-b.md', "- [x] one\n", 2_000_000_000)
+    assert reloaded.refresh() == 1
+    assert reloaded.counts('4-1-a') == (2, 2)
+    assert reloaded.epic_summary() == {'4': (2, 3, 3)}
+
+
+def test_impact_index_drops_deleted_stories(story_dir):
+    write_story(story_dir / '4-1-a.md', "Touches `src/server/routes/ndas.ts`.\n", 1_000_000_000)
+    write_story(story_dir / '4-2-b.md', "Touches `prisma/`.\n", 1_000_000_000)
+    index = StoryImpactIndex(str(story_dir))
+    index.refresh()
+    index.save()
+
+    (story_dir / '4-2-b.md').unlink()
+    reloaded = StoryImpactIndex(str(story_dir))
+    assert reloaded.refresh() == 1
+    assert reloaded.impacted_stories(['src/server/routes/ndas.ts', 'prisma/schema.prisma']) == {'4-1-a'}
+
+
+def test_unreadable_cache_loads_empty(story_dir, capsys):
+    (story_dir / '.story-progress-cache.json').write_text('{not json')
+
+    assert StoryProgressCache(str(story_dir)).stories == {}
+    assert 'Ignoring unreadable progress cache' in capsys.readouterr().err
+
+
+def test_concurrent_cache_saves_do_not_collide(story_dir):
+    write_story(story_dir / '4-1-a.md', "- [x] one\n", 1_000_000_000)
+    caches = [StoryProgressCache(str(story_dir)) for _ in range(8)]
+    for cache in caches:
+        cache.refresh()
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda cache: cache.save(), caches))
+
+    assert StoryProgressCache(str(story_dir)).counts('4-1-a') == (1, 1)
+    assert not list(story_dir.glob('.*.tmp'))
+
+
+def test_progress_dry_run_leaves_no_cache(story_dir):
+    (story_dir / 'sprint-status.yaml').write_text("development_status:\n  epic-4: in-progress\n  4-1-a: review\n")
+    write_story(story_dir / '4-1-a.md', "- [x] one\n", 1_000_000_000)
+
+    result = subprocess.run([sys.executable, str(LIB_DIR / 'sprint-status-updater.py'),
+                             '--mode', 'progress', '--dry-run'], capture_output=True, text=True)
+
+    assert result.returncode == 0, result.stderr
+    assert not (story_dir / '.story-progress-cache.json').exists()
@@ -0,0 +1,52 @@
+"""Per-epic percentiles and outlier fences behind validate-stories.py --analytics"""
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+PARAGRAPH = "A substantial paragraph that is long enough to count towards repetition."
+
+
+def test_grouped_percentiles_match_numpy(validate_stories):
+    rng = np.random.default_rng(7)
+    group = rng.integers(0, 4, size=200)
+    values = rng.normal(10, 3, size=200)
+    quantiles = [0.0, 0.25, 0.5, 0.9, 1.0]
+
+    result = validate_stories._grouped_percentiles(group, values, 4, quantiles)
+
+    for g in range(4):
+        np.testing.assert_allclose(result[g], np.percentile(values[group == g], [q * 100 for q in quantiles]))
+
+
+def test_story_metrics_repetition_score(validate_stories):
+    content = "\n\n".join([PARAGRAPH] * 3 + ["Another paragraph that is also more than fifty characters long."])
+
+    metrics = validate_stories.story_metrics(content, len(content))
+
+    assert metrics['repetition_score'] == pytest.approx(2 / 4)
+
+
+def test_analyze_corpus_flags_an_oversized_story(validate_stories, story_dir, monkeypatch):
+    monkeypatch.setattr(validate_stories, 'STORY_DIR', story_dir)
+    for n in range(1, 6):
+        (story_dir / f"5-{n}-story.md").write_text("x" * (2000 + 10 * n))
+    (story_dir / "5-6-runaway.md").write_text("x" * 20000)
+
+    report = validate_stories.analyze_corpus()
+
+    assert [(f['story'], f['metric'], f['direction']) for f in report['outliers']] == [
+        ('5-6-runaway', 'bytes', 'high'),
+    ]
+    assert report['epics']['5']['stories'] == 6
+
+
+def test_analyze_corpus_skips_stories_over_the_budget(validate_stories, story_dir, monkeypatch):
+    monkeypatch.setattr(validate_stories, 'STORY_DIR', story_dir)
+    (story_dir / "5-1-story.md").write_text("x" * 2000)
+    (story_dir / "5-2-runaway.md").write_text("\n\n".join([PARAGRAPH] * 1000))
+
+    report = validate_stories.analyze_corpus(budget=validate_stories.FileBudget(max_bytes=10_000))
+
+    assert [story for story, _ in report['pathological']] == ['5-2-runaway']
+    assert report['epics']['5']['stories'] == 1
@@ -0,0 +1,48 @@
+"""Stratified sampling and error-rate estimates in validate-stories.py"""
+
+import pytest
+
+
+def test_allocate_sample_is_proportional_with_a_floor_of_one(validate_stories):
+    population = {'1': 10, '2': 5, '3': 1}
+
+    assert validate_stories.allocate_sample(population, sample_size=8) == {'1': 5, '2': 3, '3': 1}
+    assert validate_stories.allocate_sample(population, sample_fraction=0.5) == {'1': 5, '2': 2, '3': 1}
+    # The floor of one per epic can exceed a small N
+    assert sum(validate_stories.allocate_sample(population, sample_size=2).values()) == 3
+
+
+def test_stratified_sample_is_reproducible(validate_stories, story_dir, monkeypatch):
+    monkeypatch.setattr(validate_stories, 'STORY_DIR', story_dir)
+    for epic, count in (('1', 10), ('2', 5)):
+        for n in range(1, count + 1):
+            (story_dir / f"{epic}-{n}-story.md").write_text("# Story\n")
+
+    population, first = validate_stories.stratified_sample(sample_size=6, seed=42)
+    _, second = validate_stories.stratified_sample(sample_size=6, seed=42)
+
+    assert population == {'1': 10, '2': 5}
+    assert first == second
+    assert {epic: len(files) for epic, files in first.items()} == {'1': 4, '2': 2}
+
+
+def test_estimate_error_rates_confidence_interval(validate_stories, tmp_path, monkeypatch):
+    def fake_validate(filepath, budget=None):
+        if filepath.name.startswith('bad'):
+            return [validate_stories.ValidationError(filepath.name, 'critical', 'broken')]
+        return []
+
+    monkeypatch.setattr(validate_stories, 'validate_story_file', fake_validate)
+    sample = {'1': [tmp_path / 'bad-a.md', tmp_path / 'ok-b.md'], '2': [tmp_path / 'bad-c.md']}
+
+    result = validate_stories.estimate_error_rates({'1': 4, '2': 2}, sample)
+
+    # Epic 1: weight 2/3, rate 1/2, fpc 1/2, variance 1/4 -> (2/3)^2 * 1/2 * 1/4
+    # Epic 2: weight 1/3, rate 1, fpc 1/2, single sample -> worst case 1/4
+    variance = (2 / 3) ** 2 * 0.5 * 0.25 + (1 / 3) ** 2 * 0.5 * 0.25
+    rate, low, high = result['estimates']['critical']
+    assert rate == pytest.approx(2 / 3)
+    assert low == pytest.approx(2 / 3 - 1.96 * variance ** 0.5)
+    assert high == 1.0
+    assert result['estimates']['warning'][0] == 0.0
+    assert (result['population'], result['sampled']) == (6, 3)